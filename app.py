@@ -1,19 +1,24 @@
 import os
-import shutil
-import requests
+import errno
 import streamlit as st
 from xml.etree import ElementTree as ET
-from xml.dom import minidom
 import time
-import glob
 import re
 from urllib.parse import urljoin
 import json
 import logging
-import subprocess
-import sys 
 import concurrent.futures
 import threading
+import itertools
+import collections
+import functools
+import importlib
+import importlib.util
+import translation_cache
+try:
+    import orjson # Optional: faster settings (de)serialization
+except ImportError:
+    orjson = None
 
 # --- Import Settings ---
 try:
@@ -28,7 +33,7 @@ except ImportError:
         DEFAULT_ENABLED_SCRAPERS = ["Dmm"]
         DEFAULT_FIELD_PRIORITIES = {'title': ['DMM']}
         ORDERED_PRIORITY_FIELDS_WITH_LABELS = [('title', 'Title')]
-        PRIORITY_FIELDS_ORDERED = ['title']
+        PRIORITY_FIELDS_ORDERED = ('title',)
         DEFAULT_INPUT_DIRECTORY = ""
         DEFAULT_OUTPUT_DIRECTORY = ""
         DEFAULT_TRANSLATOR_SERVICE = "None"
@@ -46,55 +51,119 @@ except ImportError:
         DEFAULT_NAMING_FOLDER_NAME_PATTERN = "{id} [{studio}] - {title}"
     app_settings = DummySettings()
 
+# Resolved once; None if the settings module doesn't define the priority field labels
+_ORDERED_PRIORITY_FIELDS_WITH_LABELS = getattr(app_settings, "ORDERED_PRIORITY_FIELDS_WITH_LABELS", None)
+
 # --- Define Settings File Path ---
 USER_SETTINGS_FILE = "user_settings.json"
 
-# --- Imports for Scraper and URL Finder ---
-SCRAPER_REGISTRY = {}
-# Define availability flags
-DMM_AVAILABLE = False
-R18DEV_AVAILABLE = False
-R18DEVJA_AVAILABLE = False
-MGS_AVAILABLE = False
-JAVLIBRARY_AVAILABLE = False 
-
-# Try importing each scraper
-try:
-    from dmm_scraper import get_dmm_url_from_id, scrape_dmm
-    SCRAPER_REGISTRY["Dmm"] = {'find': get_dmm_url_from_id, 'scrape': scrape_dmm}
-    DMM_AVAILABLE = True
-except ImportError: print("INFO: dmm_scraper.py not found or failed to import.")
-
-try:
-    from r18dev_scraper import get_r18dev_url_from_id, scrape_r18dev
-    SCRAPER_REGISTRY["r18dev"] = {'find': get_r18dev_url_from_id, 'scrape': scrape_r18dev}
-    R18DEV_AVAILABLE = True
-except ImportError: print("INFO: r18dev_scraper.py not found or failed to import.")
-
-try:
-    from r18devja_scraper import get_r18devja_url_from_id, scrape_r18devja
-    SCRAPER_REGISTRY["r18dev Ja"] = {'find': get_r18devja_url_from_id, 'scrape': scrape_r18devja}
-    R18DEVJA_AVAILABLE = True # Optional flag
-except ImportError:
-    print("INFO: r18devja_scraper.py not found or failed to import.")
+_log = logging.getLogger(__name__)
+
+# --- Precompiled Patterns ---
+# Image URLs worth handing to urljoin/st.image: absolute, protocol-relative, root-relative or data URIs
+_URL_RE = re.compile(r'^(?:https?://|//|/|data:)')
+# _to_abs fast path: scheme + authority of an http(s) page URL, and root/protocol-relative URLs urljoin would only prefix
+_URL_ORIGIN_RE = re.compile(r'^(https?:)//[^/?#]*')
+_SIMPLE_ROOTED_URL_RE = re.compile(r'^//?[\w~%-][^?#;\[\]]*(?:\?[^#;\[\]]+)?$')
+_URL_STRIPPED_CHARS_RE = re.compile(r'[\t\n\r]') # Removed by urlsplit, so their presence rules out the fast paths
+# sanitize_id_for_scraper: label prefixes stripped in order, then the ID shape used for trail truncation/formatting
+_LEADING_DIGITS_RE = re.compile(r'^\d+(?=[a-zA-Z])')
+_ID_PREFIX_PATTERNS = tuple(re.compile(p) for p in ('h_086', 'h_113', 'h_068', 'h_729', r'^h_\d+_?')) + (_LEADING_DIGITS_RE,)
+_CORE_ID_RE = re.compile(r'^(([a-z0-9_]+(?:[-_][a-z0-9_]+)*?)\-?(\d+)([a-z]{0,4}))')
+_ID_FORMAT_RE = re.compile(r'^(.*?)(\d+)([a-z]{0,4})$', re.IGNORECASE)
+_NUM_SUFFIX_RE = re.compile(r'^(\d+)([A-Z]{0,4})$')
+# generate_nfo: serialized text content (between a tag's '>' and the next '<'; both are escaped inside text and attributes)
+_NFO_TEXT_RE = re.compile(rb'>[^<]+<')
+# sanitize_filename (forbidden characters are dropped via str.translate)
+_BAD_FILENAME_CHARS_TABLE = dict.fromkeys([*range(0x20), *map(ord, '<>:"/\\|?*')])
+_WHITESPACE_RE = re.compile(r'\s+')
+_DOTS_RE = re.compile(r'\.+')
+_RESERVED_FILENAMES = frozenset({'CON', 'PRN', 'AUX', 'NUL'} | {f'COM{i}' for i in range(1, 10)} | {f'LPT{i}' for i in range(1, 10)})
+
+# --- UI Constants ---
+CRAWLER_VIEW_OPTIONS = ("Editor", "Raw Data")
+_CRAWLER_VIEW_INDEX = {view: idx for idx, view in enumerate(CRAWLER_VIEW_OPTIONS)}
+TRANSLATOR_OPTIONS = ("None", "Google", "DeepL", "DeepSeek")
+API_KEY_TRANSLATORS = ("DeepL", "DeepSeek") # Services that need an API key
+# Each module exposes translate(text, target_language, api_key=None) and is imported on first use
+TRANSLATION_MODULES = {"Google": "translate_google", "DeepL": "translate_deepl", "DeepSeek": "translate_deepseek"}
+TRANSLATION_TIMEOUT_SECONDS = 60
+
+# --- Scraper Registry (lazy) ---
+# Scraper name -> (module, find-URL function, scrape function). Modules are only located at startup
+# and imported on first use, so their transitive imports (bs4, lxml, ...) are paid when a scraper runs.
+SCRAPER_SPECS = {
+    "Dmm": ("dmm_scraper", "get_dmm_url_from_id", "scrape_dmm"),
+    "r18dev": ("r18dev_scraper", "get_r18dev_url_from_id", "scrape_r18dev"),
+    "r18dev Ja": ("r18devja_scraper", "get_r18devja_url_from_id", "scrape_r18devja"),
+    "Mgs": ("mgs_scraper", "get_mgs_url_from_id", "scrape_mgs"),
+    "Javlibrary": ("javlibrary_scraper", "get_javlibrary_url_from_id", "scrape_javlibrary"),
+}
+_LOADED_SCRAPERS = {}
+
+def _scraper_module_available(module_name):
+    try: return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError): return False
+
+def _load_scraper(scraper_name):
+    """Imports the scraper module on first use and returns its {'find': ..., 'scrape': ...} functions."""
+    scraper = _LOADED_SCRAPERS.get(scraper_name)
+    if scraper is None:
+        module_name, find_func_name, scrape_func_name = SCRAPER_SPECS[scraper_name]
+        module = importlib.import_module(module_name)
+        scraper = {'find': getattr(module, find_func_name), 'scrape': getattr(module, scrape_func_name)}
+        _LOADED_SCRAPERS[scraper_name] = scraper
+    return scraper
+
+def _loadable_scrapers(scraper_names):
+    """Imports the given scrapers on the script thread; warns about and drops any that fail to import."""
+    loadable = []
+    for scraper_name in scraper_names:
+        try:
+            _load_scraper(scraper_name)
+            loadable.append(scraper_name)
+        except Exception as e: # Usually ImportError from a missing dependency
+            st.warning(f"Scraper '{scraper_name}' is unavailable and will be skipped: {e}", icon="⚠️")
+            _log.warning("Scraper %s could not be imported: %s", scraper_name, e)
+    return loadable
+
+AVAILABLE_SCRAPER_NAMES = tuple(name for name, spec in SCRAPER_SPECS.items() if _scraper_module_available(spec[0]))
+_AVAILABLE_SCRAPER_SET = frozenset(AVAILABLE_SCRAPER_NAMES) # For membership checks
+_PRIORITY_FIELDS_SET = frozenset(app_settings.PRIORITY_FIELDS_ORDERED)
+_AVAILABLE_SCRAPERS_LOWER = {name.lower(): name for name in AVAILABLE_SCRAPER_NAMES} # Case-insensitive lookup for typed priority lists
+_PRIORITY_INPUT_KEYS = {field_key: f"priority_{field_key}" for field_key in app_settings.PRIORITY_FIELDS_ORDERED} # Widget key per priority field
+for _scraper_name, _scraper_spec in SCRAPER_SPECS.items():
+    if _scraper_name not in AVAILABLE_SCRAPER_NAMES: print(f"INFO: {_scraper_spec[0]}.py not found.")
 
-try:
-    from mgs_scraper import get_mgs_url_from_id, scrape_mgs
-    SCRAPER_REGISTRY["Mgs"] = {'find': get_mgs_url_from_id, 'scrape': scrape_mgs}
-    MGS_AVAILABLE = True
-except ImportError: print("INFO: mgs_scraper.py not found or failed to import.")
+# Define availability flags
+DMM_AVAILABLE = "Dmm" in AVAILABLE_SCRAPER_NAMES
+R18DEV_AVAILABLE = "r18dev" in AVAILABLE_SCRAPER_NAMES
+R18DEVJA_AVAILABLE = "r18dev Ja" in AVAILABLE_SCRAPER_NAMES # Optional flag
+MGS_AVAILABLE = "Mgs" in AVAILABLE_SCRAPER_NAMES
+JAVLIBRARY_AVAILABLE = "Javlibrary" in AVAILABLE_SCRAPER_NAMES
 
-try:
-    from javlibrary_scraper import get_javlibrary_url_from_id, scrape_javlibrary
-    SCRAPER_REGISTRY["Javlibrary"] = {'find': get_javlibrary_url_from_id, 'scrape': scrape_javlibrary}
-    JAVLIBRARY_AVAILABLE = True
-except ImportError:
-    print("INFO: javlibrary_scraper.py not found or failed to import.")
+# --- JSON Helpers (orjson when installed) ---
+def _json_loads(raw):
+    return orjson.loads(raw) if orjson else json.loads(raw)
 
-AVAILABLE_SCRAPER_NAMES = list(SCRAPER_REGISTRY.keys())
+def _json_dumps_bytes(obj):
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8') # Same layout as orjson's OPT_INDENT_2
 
 # --- Function to Load Settings ---
 def load_settings():
+    """Returns the merged settings; user_settings.json is only re-parsed when its mtime or size changes."""
+    try:
+        stat_result = os.stat(USER_SETTINGS_FILE)
+        file_signature = (stat_result.st_mtime_ns, stat_result.st_size) # Size too: FAT/SMB mtimes only tick every 1-2 s
+    except OSError:
+        file_signature = None
+    return _load_settings_for_mtime(file_signature)
+
+# st.cache_data hands back a copy per call, so callers may mutate the result freely.
+@st.cache_data(show_spinner=False)
+def _load_settings_for_mtime(file_signature):
     # Define defaults based on settings.py
     defaults = {
         "default_download_all_initial_state": app_settings.DEFAULT_DOWNLOAD_ALL_INITIAL_STATE,
@@ -118,18 +187,24 @@ def load_settings():
         "editor_show_screenshots": app_settings.DEFAULT_EDITOR_SHOW_SCREENSHOTS,
     }
     # Filter defaults based on availability right away
-    defaults["enabled_scrapers"] = [s for s in defaults["enabled_scrapers"] if s in AVAILABLE_SCRAPER_NAMES]
+    defaults["enabled_scrapers"] = [s for s in defaults["enabled_scrapers"] if s in _AVAILABLE_SCRAPER_SET]
     validated_default_priorities = {}
     for field, prio_list in defaults["field_priorities"].items():
          # Make sure the field itself is valid according to the (updated) ordered list
-        if field in app_settings.PRIORITY_FIELDS_ORDERED:
-             validated_default_priorities[field] = [s for s in prio_list if s in AVAILABLE_SCRAPER_NAMES]
+        if field in _PRIORITY_FIELDS_SET:
+             validated_default_priorities[field] = [s for s in prio_list if s in _AVAILABLE_SCRAPER_SET]
     defaults["field_priorities"] = validated_default_priorities
 
-    if os.path.exists(USER_SETTINGS_FILE):
+    # EAFP: open directly rather than probing for the file first (file_signature is None when it was missing at stat time)
+    try:
+        with open(USER_SETTINGS_FILE, 'rb') as f:
+            raw_user_settings = f.read()
+    except FileNotFoundError:
+        raw_user_settings = None
+
+    if raw_user_settings is not None:
         try:
-            with open(USER_SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                user_settings = json.load(f)
+            user_settings = _json_loads(raw_user_settings)
 
             # Merge defaults with user settings, applying validation/filtering
             loaded_settings = {**defaults}
@@ -142,7 +217,7 @@ def load_settings():
 
             # Load and validate enabled scrapers
             user_enabled = user_settings.get("enabled_scrapers", [])
-            loaded_settings["enabled_scrapers"] = [s for s in user_enabled if s in AVAILABLE_SCRAPER_NAMES]
+            loaded_settings["enabled_scrapers"] = [s for s in user_enabled if s in _AVAILABLE_SCRAPER_SET]
 
             # Load and validate priorities
             user_priorities = user_settings.get("field_priorities", {})
@@ -151,7 +226,7 @@ def load_settings():
             for field_key in app_settings.PRIORITY_FIELDS_ORDERED:
                 default_prio = defaults["field_priorities"].get(field_key, [])
                 user_prio = user_priorities.get(field_key, default_prio)
-                validated_priorities[field_key] = [s for s in user_prio if s in AVAILABLE_SCRAPER_NAMES]
+                validated_priorities[field_key] = [s for s in user_prio if s in _AVAILABLE_SCRAPER_SET]
             loaded_settings["field_priorities"] = validated_priorities
 
             # Load Translation Settings
@@ -163,12 +238,11 @@ def load_settings():
             loaded_settings["keep_original_description"] = user_settings.get("keep_original_description", defaults["keep_original_description"])
 
             raw_blacklist = user_settings.get("genre_blacklist", defaults["genre_blacklist"])
-            if isinstance(raw_blacklist, list):
-                loaded_settings["genre_blacklist"] = [
-                    str(g).strip().lower() for g in raw_blacklist if isinstance(g, str) and str(g).strip()
-                ]
-            else: # If not a list, use default
-                loaded_settings["genre_blacklist"] = defaults["genre_blacklist"]
+            if not isinstance(raw_blacklist, (list, tuple)): # If not a list, use default
+                raw_blacklist = defaults["genre_blacklist"] or []
+            # Single normalization path; always builds a fresh list rather than aliasing the default
+            normalized_blacklist = (g.strip().lower() for g in raw_blacklist if isinstance(g, str))
+            loaded_settings["genre_blacklist"] = [g for g in normalized_blacklist if g]
 
             # Load Naming Convention Settings
             loaded_settings["naming_poster_filename_pattern"] = user_settings.get("naming_poster_filename_pattern", defaults["naming_poster_filename_pattern"])
@@ -187,6 +261,14 @@ def load_settings():
         print(f"{USER_SETTINGS_FILE} not found. Using default settings.")
         return defaults
 
+# --- Helper: Set Genre Blacklist State ---
+def set_genre_blacklist_state(blacklist):
+    """Stores the blacklist and its comma-joined display string; the join only reruns when the list changes."""
+    blacklist = blacklist or []
+    if "_genre_blacklist_str" not in st.session_state or st.session_state.get("genre_blacklist") != blacklist:
+        st.session_state._genre_blacklist_str = ", ".join(blacklist)
+    st.session_state.genre_blacklist = blacklist
+
 # --- Function to Save Settings ---
 def save_settings_to_file():
     settings_to_save = {
@@ -209,9 +291,16 @@ def save_settings_to_file():
         "naming_folder_name_pattern": st.session_state.naming_folder_name_pattern,
         "editor_show_screenshots": st.session_state.get("editor_show_screenshots", app_settings.DEFAULT_EDITOR_SHOW_SCREENSHOTS),
     }
+    # Skip disk I/O when nothing changed since this session's last successful save
+    settings_hash = hash(json.dumps(settings_to_save, sort_keys=True, ensure_ascii=False))
+    if settings_hash == st.session_state.get("_settings_hash") and os.path.exists(USER_SETTINGS_FILE):
+        st.toast("No settings changed.", icon="💾")
+        return
     try:
-        with open(USER_SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(settings_to_save, f, indent=4, ensure_ascii=False)
+        with open(USER_SETTINGS_FILE, 'wb') as f:
+            f.write(_json_dumps_bytes(settings_to_save))
+        _load_settings_for_mtime.clear() # A same-size rewrite within one mtime tick would otherwise hit the stale entry
+        st.session_state._settings_hash = settings_hash
         st.toast("Settings saved successfully!", icon="💾")
     except Exception as e:
         st.error(f"Error saving settings to {USER_SETTINGS_FILE}: {e}")
@@ -237,7 +326,7 @@ def sync_settings_from_file_to_state():
     st.session_state.translate_title = loaded_settings["translate_title"]
     st.session_state.translate_description = loaded_settings["translate_description"]
     st.session_state.keep_original_description = loaded_settings["keep_original_description"]
-    st.session_state.genre_blacklist = loaded_settings.get("genre_blacklist", [])
+    set_genre_blacklist_state(loaded_settings.get("genre_blacklist", []))
     st.session_state.naming_poster_filename_pattern = loaded_settings["naming_poster_filename_pattern"]
     st.session_state.naming_folder_image_filename_pattern = loaded_settings["naming_folder_image_filename_pattern"]
     st.session_state.naming_screenshot_filename_pattern = loaded_settings["naming_screenshot_filename_pattern"]
@@ -286,7 +375,7 @@ if 'initialized' not in st.session_state:
     st.session_state.javlibrary_creds_provided_this_session = False
 
     # Other states you might have
-    st.session_state.genre_blacklist = loaded_settings.get("genre_blacklist", [])
+    set_genre_blacklist_state(loaded_settings.get("genre_blacklist", []))
     st.session_state.last_crawl_was_recursive = False
 
     # Naming Convention Settings
@@ -306,6 +395,40 @@ if 'initialized' not in st.session_state:
     st.session_state.initialized = True
 # --- End Session State ---
 
+# --- Helper: Editor String Conversion ---
+def _to_str(val):
+    return "" if val is None else val if type(val) is str else str(val)
+
+# Editor widget key -> movie data key, pre-populated via _to_str; special cases stay explicit in the editor
+_EDITOR_FIELD_MAP = (
+    ('editor_id', 'id'), ('editor_content_id', 'content_id'), ('editor_title', 'title'),
+    ('editor_original_title', 'originaltitle'), ('editor_desc', 'description'),
+    ('editor_year', 'release_year'), ('editor_date', 'release_date'), ('editor_runtime', 'runtime'),
+    ('editor_director', 'director'), ('editor_maker', 'maker'), ('editor_label', 'label'),
+    ('editor_series', 'series'),
+)
+# ---
+
+# --- Helper: Resolve Image URL Against Page URL ---
+def _to_abs(base, url):
+    # urljoin deletes tab/CR/LF anywhere in a URL, so URLs containing them always go through it
+    if _URL_STRIPPED_CHARS_RE.search(url): return urljoin(base, url)
+    # Scrapers mostly return absolute URLs already; skip urljoin's parse for those
+    if url.startswith(('http://', 'https://')): return url
+    # Protocol-relative ("//cdn/...") and root-relative ("/img/...") URLs without dot segments: plain prefix
+    if '/.' not in url and _SIMPLE_ROOTED_URL_RE.match(url):
+        origin = _URL_ORIGIN_RE.match(base)
+        if origin and not _URL_STRIPPED_CHARS_RE.search(origin.group(0)):
+            return (origin.group(1) if url[1] == '/' else origin.group(0)) + url
+    return urljoin(base, url)
+# ---
+
+# --- Helper: Case-Insensitive Prefix Check ---
+def _startswith_ci(text, prefix):
+    # Lowercases only the prefix-length head of text instead of a copy of the whole (possibly long) title
+    return text[:len(prefix)].lower() == prefix.lower()
+# ---
+
 # --- Helper: Determine Auto Poster URL ---
 def get_auto_poster_url(data):
     poster_url = data.get('cover_url');
@@ -315,9 +438,128 @@ def get_auto_poster_url(data):
     return first_screenshot_url
 # ---
 
+# --- Shared HTTP Session for Images ---
+@st.cache_resource
+def _get_image_http_session():
+    """Keep-alive session (pooled connections, retries on connection errors) reused by editor previews and organizer downloads."""
+    import requests # Deferred: only needed once images are fetched
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.3))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = 'Mozilla/5.0...'
+    return session
+# ---
+
+# --- Editor Image Cache & Preloading ---
+_EDITOR_IMAGE_CACHE_MAX_ENTRIES = 256
+
+@st.cache_resource
+def _get_editor_image_cache():
+    """(url -> image bytes LRU, lock, URLs being fetched): filled by preload workers, read by the editor; shared across reruns and sessions."""
+    return collections.OrderedDict(), threading.Lock(), set()
+
+def _fetch_image_bytes(session, image_cache, url, referer=""):
+    # Runs on preload workers, which have no ScriptRunContext: only plain objects passed in, no st calls or st caches
+    cache, lock, in_flight = image_cache
+    try:
+        r = session.get(url, timeout=15, headers={'Referer': referer or 'https://google.com/'}); r.raise_for_status()
+        with lock:
+            cache[url] = r.content
+            while len(cache) > _EDITOR_IMAGE_CACHE_MAX_ENTRIES: cache.popitem(last=False)
+    except Exception as e: # Failures stay uncached; the editor keeps handing the URL to the browser
+        _log.debug("Image preload failed for %s: %s", url, e)
+    finally:
+        with lock: in_flight.discard(url)
+
+@st.cache_resource
+def _get_image_preload_executor():
+    # One pool shared across reruns and sessions (module globals are re-created on every rerun)
+    return concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="img_preload")
+
+def _editor_image_source(abs_url):
+    """Returns preloaded image bytes for st.image, or the URL itself (loaded by the browser) when they aren't cached yet. Never blocks."""
+    cache, lock, _ = _get_editor_image_cache()
+    with lock:
+        image_bytes = cache.get(abs_url)
+        if image_bytes is not None: cache.move_to_end(abs_url)
+    return abs_url if image_bytes is None else image_bytes
+
+def _preload_movie_images(*movie_keys):
+    """Warms the image cache for the poster and screenshots of the given movies in background threads."""
+    image_cache = _get_editor_image_cache()
+    cache, lock, in_flight = image_cache
+    session = _get_image_http_session()
+    executor = _get_image_preload_executor()
+    for movie_key in movie_keys:
+        data = st.session_state.all_movie_data.get(movie_key) if movie_key else None
+        if not data: continue
+        source_page_url = data.get('url', '') or ''
+        image_urls = [data.get('poster_manual_url') or get_auto_poster_url(data)] + list(data.get('screenshot_urls', []) or [])
+        for url in dict.fromkeys(u for u in image_urls if u and _URL_RE.match(u)):
+            abs_url = _to_abs(source_page_url, url)
+            if not abs_url.startswith(('http://', 'https://')): continue
+            with lock:
+                if abs_url in cache or abs_url in in_flight: continue
+                in_flight.add(abs_url)
+            executor.submit(_fetch_image_bytes, session, image_cache, abs_url, source_page_url)
+# ---
+
+# --- Organizer Image Downloads ---
+_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+_IMAGE_MIME_EXTENSIONS = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/gif': '.gif', 'image/webp': '.webp'}
+
+@st.cache_resource
+def _get_image_download_executor():
+    # A movie's poster and screenshots download concurrently; one pool shared across reruns and sessions
+    return concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="img_download")
+
+def _download_image_file(session, abs_url, target_dir, safe_base_filename, referer="", existing_names=frozenset()):
+    """
+    Saves one image as target_dir/safe_base_filename + extension (taken from the response content type) and returns its path.
+    An existing file with any known image extension (looked up in existing_names, the normcased listing of target_dir) is reused without a request.
+    Runs on a download worker thread, so failures are raised for the organizer to report. The body is written to a
+    temporary file in target_dir and moved into place, so concurrent downloads of the same name never interleave.
+    """
+    import shutil, tempfile # Deferred: only needed when organizing
+    for ext in _IMAGE_EXTENSIONS:
+        if os.path.normcase(f"{safe_base_filename}{ext}") in existing_names:
+            return os.path.join(target_dir, f"{safe_base_filename}{ext}")
+    headers = {'Referer': referer or 'https://google.com/'}
+    with session.get(abs_url, stream=True, timeout=30, headers=headers) as r:
+        r.raise_for_status()
+        content_type = r.headers.get('content-type'); final_ext = '.jpg'
+        if content_type: final_ext = _IMAGE_MIME_EXTENSIONS.get(content_type.split(';')[0].lower(), '.jpg')
+        final_filename = f"{safe_base_filename}{final_ext}"
+        final_target_img_path = os.path.join(target_dir, final_filename)
+        if not os.path.exists(final_target_img_path):
+            r.raw.decode_content = True # Undo gzip/deflate transfer encoding like iter_content does
+            temp_fd, temp_path = tempfile.mkstemp(suffix='.part', prefix=f".{final_filename}.", dir=target_dir)
+            try:
+                with os.fdopen(temp_fd, 'wb') as f:
+                    shutil.copyfileobj(r.raw, f, length=1 << 18) # Copy loop runs in C, 256 KiB per write
+                if os.path.exists(final_target_img_path): os.remove(temp_path) # Another worker finished first: keep its file
+                else: os.replace(temp_path, final_target_img_path)
+            except BaseException:
+                try: os.remove(temp_path)
+                except OSError: pass
+                raise
+            _log.debug("[DEBUG DL] Successfully downloaded: %s to %s", final_filename, target_dir)
+        else:
+            _log.debug("[DEBUG DL] Image '%s' already exists in %s (checked again).", final_filename, target_dir)
+        return final_target_img_path
+# ---
+
 # --- Generate NFO Function ---
-def generate_nfo(data, filename, download_all_flag):
+def generate_nfo(data, filename, download_all_flag, messages=None):
     # download_all_flag is the per-movie value
+    # messages: when given, warnings/errors are appended as (st function, text, icon) for the script thread to show
+
+    def notify(kind, text):
+        if messages is None: getattr(st, kind)(text)
+        else: messages.append((kind, text, None))
 
     # Helper to add an element if value is not None/empty
     def add_element(parent, tag_name, text_value, attributes=None):
@@ -342,24 +584,21 @@ def generate_nfo(data, filename, download_all_flag):
         return elem
 
     movie = ET.Element('movie')
-    base_page_url = data.get('url', '') # For resolving relative image URLs
+    _get = data.get # Bound once; looked up for nearly every tag below
+    base_page_url = _get('url', '') # For resolving relative image URLs
 
     # --- Order roughly based on blueprint ---
-    add_element(movie, 'title', data.get('title'))
-    add_element(movie, 'originaltitle', data.get('originaltitle'))
+    add_element(movie, 'title', _get('title'))
+    add_element(movie, 'originaltitle', _get('originaltitle'))
     add_empty_element(movie, 'epbookmark')
-    add_element(movie, 'year', data.get('release_year'))
+    add_element(movie, 'year', _get('release_year'))
 
     # Ratings
-    rating_value_from_data = data.get('rating')
-    rating_val_to_use = None
+    rating_val_to_use = _get('rating')
     votes_val_to_use = "0"
-
-    if isinstance(rating_value_from_data, dict):
-        rating_val_to_use = rating_value_from_data.get('Rating')
-        votes_val_to_use = str(rating_value_from_data.get('Votes', '0'))
-    elif rating_value_from_data is not None:
-        rating_val_to_use = rating_value_from_data
+    if isinstance(rating_val_to_use, dict): # Only scrapers returning {'Rating', 'Votes'} take this branch
+        votes_val_to_use = str(rating_val_to_use.get('Votes', '0'))
+        rating_val_to_use = rating_val_to_use.get('Rating')
 
     if rating_val_to_use is not None and str(rating_val_to_use).strip():
         ratings_tag = ET.SubElement(movie, 'ratings')
@@ -375,48 +614,50 @@ def generate_nfo(data, filename, download_all_flag):
     add_element(movie, 'top250', "0") # As per blueprint
 
     # Set (Series)
-    series_name = data.get('series')
-    if series_name and str(series_name).strip():
+    series_name = _get('series')
+    has_series = bool(series_name and str(series_name).strip())
+    if has_series:
         set_tag = ET.SubElement(movie, 'set')
         add_element(set_tag, 'name', series_name)
         add_empty_element(set_tag, 'overview') # As per blueprint
 
-    add_element(movie, 'plot', data.get('description'))
-    add_element(movie, 'outline', data.get('description')) # Duplicate plot for outline
-    add_element(movie, 'tagline', data.get('tagline'))
-    add_element(movie, 'runtime', data.get('runtime'))
+    description = _get('description')
+    add_element(movie, 'plot', description)
+    add_element(movie, 'outline', description) # Duplicate plot for outline
+    add_element(movie, 'tagline', _get('tagline'))
+    add_element(movie, 'runtime', _get('runtime'))
 
     # Primary Poster Thumb (outside fanart)
-    primary_image_url_to_use = data.get('poster_manual_url') or get_auto_poster_url(data)
+    primary_image_url_to_use = _get('poster_manual_url') or get_auto_poster_url(data)
     if primary_image_url_to_use:
         try:
-            abs_primary_url = urljoin(base_page_url, primary_image_url_to_use)
+            abs_primary_url = _to_abs(base_page_url, primary_image_url_to_use)
             add_element(movie, 'thumb', abs_primary_url, attributes={'aspect': 'poster'})
         except Exception as e:
-            st.warning(f"Could not process primary image URL {primary_image_url_to_use} for NFO <thumb>: {e}")
+            notify('warning', f"Could not process primary image URL {primary_image_url_to_use} for NFO <thumb>: {e}")
 
-    add_element(movie, 'mpaa', data.get('mpaa'))
+    add_element(movie, 'mpaa', _get('mpaa'))
     add_empty_element(movie, 'certification') # As per blueprint
     add_empty_element(movie, 'id') # Movie root ID tag, empty as per blueprint
 
-    add_element(movie, 'premiered', data.get('release_date'))
+    add_element(movie, 'premiered', _get('release_date'))
     add_element(movie, 'watched', "false") # As per blueprint
     add_element(movie, 'playcount', "0") # As per blueprint
     add_empty_element(movie, 'lastplayed') # As per blueprint
 
     # Genres
-    for genre_text in data.get('genres', []):
+    for genre_text in _get('genres', []):
         add_element(movie, 'genre', genre_text)
 
-    add_element(movie, 'studio', data.get('maker'))
-    add_element(movie, 'director', data.get('director'))
+    add_element(movie, 'studio', _get('maker'))
+    add_element(movie, 'director', _get('director'))
 
     # Tag (from series name, as per blueprint)
-    if series_name and str(series_name).strip():
+    if has_series:
         add_element(movie, 'tag', series_name)
 
     # Actors
-    for actor_data in data.get('actresses', []):
+    for actor_data in _get('actresses', []):
         actor_name = actor_data.get('name', '')
         if actor_name and str(actor_name).strip():
             actor_tag = ET.SubElement(movie, 'actor')
@@ -428,74 +669,81 @@ def generate_nfo(data, filename, download_all_flag):
     add_empty_element(movie, 'trailer') # Empty for now, as per blueprint
 
     # --- Fanart section ---
-    fanart_thumbs_to_add = [] # Initialize list for ALL fanart thumbs
+    fanart_thumbs_to_add = [] # Initialize list for ALL fanart thumbs (kept unique as it is built)
+    seen_fanart_urls = set()
     # 1. Get the primary image URL (what was previously the poster)
     # primary_image_url_to_use is already defined above
     if primary_image_url_to_use:
         try:
-            abs_primary_url = urljoin(base_page_url, primary_image_url_to_use)
-            fanart_thumbs_to_add.insert(0, abs_primary_url)
+            abs_primary_url = _to_abs(base_page_url, primary_image_url_to_use)
+            fanart_thumbs_to_add.append(abs_primary_url)
+            seen_fanart_urls.add(abs_primary_url)
         except Exception as e:
-            st.warning(f"Could not process primary image URL {primary_image_url_to_use} for NFO fanart: {e}")
+            notify('warning', f"Could not process primary image URL {primary_image_url_to_use} for NFO fanart: {e}")
 
     # 2. Add screenshots if flag is set
     if download_all_flag: # Use the flag passed into the function
-        screenshot_urls = data.get('screenshot_urls', [])
-        primary_abs_url_for_check = fanart_thumbs_to_add[0] if fanart_thumbs_to_add else None
+        screenshot_urls = _get('screenshot_urls', [])
         for ss_url in screenshot_urls:
             if ss_url:
                  try:
-                     abs_ss_url = urljoin(base_page_url, ss_url)
-                     if abs_ss_url != primary_abs_url_for_check and abs_ss_url not in fanart_thumbs_to_add:
+                     abs_ss_url = _to_abs(base_page_url, ss_url)
+                     if abs_ss_url not in seen_fanart_urls:
                           fanart_thumbs_to_add.append(abs_ss_url)
+                          seen_fanart_urls.add(abs_ss_url)
                  except Exception as e:
-                     st.warning(f"Could not add screenshot thumb {ss_url} to NFO fanart: {e}")
+                     notify('warning', f"Could not add screenshot thumb {ss_url} to NFO fanart: {e}")
 
     # 3. Create the <fanart> tag and add all collected <thumb> elements
     if fanart_thumbs_to_add:
         fanart = ET.SubElement(movie, 'fanart')
-        processed_urls = set()
-        final_thumb_list = []
         for thumb_url in fanart_thumbs_to_add:
-            if thumb_url not in processed_urls:
-                final_thumb_list.append(thumb_url)
-                processed_urls.add(thumb_url)
-        for thumb_url in final_thumb_list:
             try:
                 ET.SubElement(fanart, 'thumb').text = thumb_url
             except Exception as e:
-                st.warning(f"Could not write fanart thumb {thumb_url} to NFO: {e}")
+                notify('warning', f"Could not write fanart thumb {thumb_url} to NFO: {e}")
     # --- END REVERTED fanart section ---
 
 
     # Original Filename
-    original_basename_from_data = data.get('_original_filename_base')
-    original_filepath_from_data = data.get('original_filepath')
+    original_basename_from_data = _get('_original_filename_base')
+    original_filepath_from_data = _get('original_filepath')
     if original_basename_from_data and original_filepath_from_data:
         try:
             _, ext = os.path.splitext(os.path.basename(original_filepath_from_data))
             if ext:
                 add_element(movie, 'original_filename', f"{original_basename_from_data}{ext}")
         except Exception as e:
-            st.warning(f"Could not determine original_filename: {e}")
+            notify('warning', f"Could not determine original_filename: {e}")
 
     # Source (text field, e.g., "dmm_jp", as per blueprint)
-    add_element(movie, 'source', data.get('source', 'unknown'))
+    add_element(movie, 'source', _get('source', 'unknown'))
     add_empty_element(movie, 'edition') # As per blueprint
 
 
     # --- XML Output ---
     try:
-        xml_str = ET.tostring(movie, encoding='UTF-8', method='xml')
-        xml_declaration = '<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>\n'
-        pretty_xml_str = minidom.parseString(xml_str).toprettyxml(indent="  ")
-        pretty_xml_str = pretty_xml_str.replace('<?xml version="1.0" ?>', '', 1).strip()
-        final_xml = xml_declaration + pretty_xml_str
+        ET.indent(movie, space="  ")
+        # Write the declaration ourselves: ElementTree can't emit standalone="yes"
+        # Match the old minidom serializer, so NFOs it wrote still compare equal below: empty elements as "<tag/>"
+        # (ElementTree writes "<tag />"; " />" can't occur elsewhere since '>' is escaped in text and attributes),
+        # '"' in text as "&quot;" (ElementTree only escapes it inside attribute values), and CR/CRLF in text as LF
+        # (the old code re-parsed the tree, which normalizes line endings)
+        nfo_bytes = ET.tostring(movie, encoding='utf-8', xml_declaration=False).replace(b' />', b'/>')
+        if b'\r' in nfo_bytes:
+            nfo_bytes = nfo_bytes.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        if b'"' in nfo_bytes:
+            nfo_bytes = _NFO_TEXT_RE.sub(lambda m: m.group(0).replace(b'"', b'&quot;'), nfo_bytes)
+        nfo_bytes = b'<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>\n' + nfo_bytes
+        try: # Re-organizing unchanged movies leaves their NFO (and its mtime) alone
+            with open(filename, 'rb') as f:
+                if f.read(len(nfo_bytes) + 1) == nfo_bytes: return
+        except OSError: pass
         os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'w', encoding='UTF-8') as f:
-            f.write(final_xml)
+        with open(filename, 'wb') as f:
+            f.write(nfo_bytes)
     except Exception as e:
-        st.error(f"Error writing NFO file '{filename}': {e}")
+        notify('error', f"Error writing NFO file '{filename}': {e}")
         raise IOError(f"Error writing NFO file '{filename}': {e}")
 # --- End Generate NFO ---
 
@@ -507,27 +755,22 @@ def sanitize_id_for_scraper(raw_id):
     into a more standard format (e.g., ABC-123, NMSL-003, ABF-118, ABC-123).
     """
     if not raw_id: return None
-    logging.debug(f"[SANITIZE] Original raw_id: {raw_id}")
+    _log.debug("[SANITIZE] Original raw_id: %s", raw_id)
 
     # --- 1. Prefix Cleaning ---
-    prefixes_to_clean = [
-        'h_086', 'h_113', 'h_068', 'h_729',
-        r'^h_\d+_?',
-        r'^\d+(?=[a-zA-Z])'
-    ]
     id_after_prefix_clean = raw_id.lower()
-    for prefix_pattern in prefixes_to_clean:
+    for prefix_re in _ID_PREFIX_PATTERNS:
         original_len = len(id_after_prefix_clean)
-        if prefix_pattern == r'^\d+(?=[a-zA-Z])':
-            id_after_prefix_clean = re.sub(prefix_pattern, '', id_after_prefix_clean)
+        if prefix_re is _LEADING_DIGITS_RE:
+            id_after_prefix_clean = prefix_re.sub('', id_after_prefix_clean)
         else:
-            match_prefix = re.match(prefix_pattern, id_after_prefix_clean)
+            match_prefix = prefix_re.match(id_after_prefix_clean)
             if match_prefix:
                 id_after_prefix_clean = id_after_prefix_clean[len(match_prefix.group(0)):]
         if len(id_after_prefix_clean) < original_len:
-            logging.debug(f"[SANITIZE] Removed prefix matching '{prefix_pattern}'. Remaining: '{id_after_prefix_clean}'")
+            _log.debug("[SANITIZE] Removed prefix matching '%s'. Remaining: '%s'", prefix_re.pattern, id_after_prefix_clean)
 
-    logging.debug(f"[SANITIZE] ID after prefix cleaning: '{id_after_prefix_clean}'")
+    _log.debug("[SANITIZE] ID after prefix cleaning: '%s'", id_after_prefix_clean)
 
     # --- 2. Core ID Extraction and Trail Truncation ---
     id_to_format = id_after_prefix_clean # Default
@@ -541,14 +784,14 @@ def sanitize_id_for_scraper(raw_id):
     #   - Optionally followed by a short (0-4 char) alphabetic suffix.
     # This needs to be anchored at the start of the string (after prefix cleaning).
     # The (?=...) is a lookahead to check for common trail separators or end of string.
-    core_id_regex = r'^(([a-z0-9_]+(?:[-_][a-z0-9_]+)*?)\-?(\d+)([a-z]{0,4}))'
+    # (compiled as _CORE_ID_RE) r'^(([a-z0-9_]+(?:[-_][a-z0-9_]+)*?)\-?(\d+)([a-z]{0,4}))'
     # Breakdown of the capturing group `(...)`:
     # `([a-z0-9_]+(?:[-_][a-z0-9_]+)*?)` : Studio/text prefix (non-greedy to allow hyphen to be next)
     # `\-?`                               : Optional hyphen
     # `(\d+)`                             : Number part
     # `([a-z]{0,4})`                      : Optional short suffix (like 'a', 'vr')
 
-    match = re.match(core_id_regex, id_after_prefix_clean)
+    match = _CORE_ID_RE.match(id_after_prefix_clean)
 
     if match:
         potential_core_id = match.group(1) # The full matched potential core ID
@@ -564,34 +807,33 @@ def sanitize_id_for_scraper(raw_id):
 
             if char_after_core in trail_separators:
                 id_to_format = potential_core_id
-                removed_trail = id_after_prefix_clean[end_of_potential_core:]
-                logging.debug(f"[SANITIZE] Trail '{removed_trail}' (separator: '{char_after_core}') identified. Core for formatting: '{id_to_format}'")
+                _log.debug("[SANITIZE] Trail '%s' (separator: '%s') identified. Core for formatting: '%s'", id_after_prefix_clean[end_of_potential_core:], char_after_core, id_to_format)
             # else if re.match(trail_keywords_pattern, id_after_prefix_clean[end_of_potential_core:]):
             #     id_to_format = potential_core_id
             #     removed_trail = id_after_prefix_clean[end_of_potential_core:]
-            #     logging.debug(f"[SANITIZE] Trail '{removed_trail}' (keyword match) identified. Core for formatting: '{id_to_format}'")
+            #     _log.debug("[SANITIZE] Trail '%s' (keyword match) identified. Core for formatting: '%s'", removed_trail, id_to_format)
             else:
                 # If no common trail separator/keyword, assume the matched part is the full ID or needs to be handled by final formatting
                 # This path might be taken if the suffix in core_id_regex was shorter than actual, or if it's an unusual ID.
                 # We will still use `potential_core_id` if the regex matched something, otherwise `id_after_prefix_clean`
                 id_to_format = potential_core_id # Stick with what core_id_regex found as the best guess
-                logging.debug(f"[SANITIZE] Core ID regex matched '{potential_core_id}'. No clear trail separator immediately after. Proceeding with this for formatting.")
+                _log.debug("[SANITIZE] Core ID regex matched '%s'. No clear trail separator immediately after. Proceeding with this for formatting.", potential_core_id)
         else:
             # The core_id_regex matched the entire string
             id_to_format = potential_core_id
-            logging.debug(f"[SANITIZE] Core ID regex matched the entire string: '{id_to_format}'. No trail.")
+            _log.debug("[SANITIZE] Core ID regex matched the entire string: '%s'. No trail.", id_to_format)
     else:
-        logging.debug(f"[SANITIZE] Core ID regex did not match '{id_after_prefix_clean}'. Will use it as is for final formatting.")
+        _log.debug("[SANITIZE] Core ID regex did not match '%s'. Will use it as is for final formatting.", id_after_prefix_clean)
         # id_to_format remains id_after_prefix_clean
 
-    logging.debug(f"[SANITIZE] ID before final formatting: '{id_to_format}'")
+    _log.debug("[SANITIZE] ID before final formatting: '%s'", id_to_format)
 
     # --- 3. Standard ID Formatting (applied to id_to_format) ---
     # This regex splits the id_to_format into its main components:
     # Group 1: The entire text/studio prefix part (e.g., "ebod", "studio-name-", "some_prefix_")
     # Group 2: The numeric part (e.g., "123")
     # Group 3: An optional short alphabetic suffix (0-4 chars, e.g., "a", "vr")
-    final_format_match = re.match(r'^(.*?)(\d+)([a-z]{0,4})$', id_to_format, re.IGNORECASE)
+    final_format_match = _ID_FORMAT_RE.match(id_to_format)
 
     if final_format_match:
         raw_text_part = final_format_match.group(1)
@@ -639,7 +881,7 @@ def sanitize_id_for_scraper(raw_id):
              formatted_id = formatted_id[:-1]
 
 
-        logging.debug(f"[SANITIZE] Formatted ID: {formatted_id}")
+        _log.debug("[SANITIZE] Formatted ID: %s", formatted_id)
         return formatted_id
     else:
         fallback_id = id_to_format.upper().replace('_','').replace('-','')
@@ -648,25 +890,28 @@ def sanitize_id_for_scraper(raw_id):
             if len(parts) == 2 and parts[1].isdigit():
                 num = parts[1].lstrip('0').zfill(3)
                 fallback_id = f"{parts[0].replace('_','')}-{num}"
-            elif len(parts) == 2 and re.match(r'^\d+[A-Z]{0,4}$', parts[1]):
-                 num_suffix_match = re.match(r'^(\d+)([A-Z]{0,4})$', parts[1])
-                 if num_suffix_match:
-                     num = num_suffix_match.group(1).lstrip('0').zfill(3)
-                     suf = num_suffix_match.group(2)
-                     fallback_id = f"{parts[0].replace('_','')}-{num}{suf}"
-        logging.debug(f"[SANITIZE] Final formatting pattern didn't match '{id_to_format}', using fallback: '{fallback_id if fallback_id else id_to_format.upper()}'")
+            elif len(parts) == 2 and (num_suffix_match := _NUM_SUFFIX_RE.match(parts[1])):
+                 num = num_suffix_match.group(1).lstrip('0').zfill(3)
+                 suf = num_suffix_match.group(2)
+                 fallback_id = f"{parts[0].replace('_','')}-{num}{suf}"
+        _log.debug("[SANITIZE] Final formatting pattern didn't match '%s', using fallback: '%s'", id_to_format, fallback_id or id_to_format.upper())
         return fallback_id if fallback_id else id_to_format.upper()
 # --- End Sanitize ID ---
 
 # --- Helper Functions: sanitize_filename ---
 def sanitize_filename(name):
     if not isinstance(name, str): name = str(name);
-    sanitized = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '', name); sanitized = re.sub(r'\s+', ' ', sanitized).strip(); sanitized = re.sub(r'\.+', '.', sanitized).strip(' .'); reserved_names = {'CON', 'PRN', 'AUX', 'NUL'} | {f'COM{i}' for i in range(1, 10)} | {f'LPT{i}' for i in range(1, 10)};
-    if sanitized.upper() in reserved_names: sanitized = "_" + sanitized;
+    return _sanitize_filename_str(name)
+
+@functools.lru_cache(maxsize=4096) # Folder, NFO and image base names repeat across the movies of one organize run (Streamlit reruns re-create the cache)
+def _sanitize_filename_str(name):
+    sanitized = name.translate(_BAD_FILENAME_CHARS_TABLE); sanitized = _WHITESPACE_RE.sub(' ', sanitized).strip(); sanitized = _DOTS_RE.sub('.', sanitized).strip(' .');
+    if sanitized.upper() in _RESERVED_FILENAMES: sanitized = "_" + sanitized;
     sanitized = sanitized.strip(' .');
     if not sanitized: return "empty_name_fallback";
     max_len = 250;
-    while len(sanitized.encode('utf-8')) > max_len: sanitized = sanitized[:-1];
+    encoded = sanitized.encode('utf-8');
+    if len(encoded) > max_len: sanitized = encoded[:max_len].decode('utf-8', 'ignore');
     sanitized = sanitized.strip(' .'); return sanitized
 
 # --- Helper function for Formatting Strings with Placeholders ---
@@ -759,23 +1004,30 @@ def format_and_truncate_folder_name(id_val, studio_val, title_val, max_len=150):
 # --- End Helper Functions ---
 
 # --- Helper Function for Concurrent Scraping ---
+@st.cache_resource
+def _get_scraper_executor():
+    """One scraper pool for the whole app instead of a new ThreadPoolExecutor per movie/attempt."""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=min(32, 4 * len(SCRAPER_SPECS)), thread_name_prefix="scraper")
+
 def run_single_scraper_task(scraper_name, movie_id,
                             user_agent_for_javlibrary=None, 
                             cf_token_for_javlibrary=None):
     
     thread_name = threading.current_thread().name
-    print(f"[{thread_name}] Task Start: Scraper='{scraper_name}', ID='{movie_id}'")
+    _log.debug("[%s] Task Start: Scraper='%s', ID='%s'", thread_name, scraper_name, movie_id)
 
-    if scraper_name not in SCRAPER_REGISTRY: 
-        print(f"[{thread_name}] Error: Scraper '{scraper_name}' not found in registry.")
-        return scraper_name, None
+    if scraper_name not in _AVAILABLE_SCRAPER_SET: 
+        _log.debug("[%s] Error: Scraper '%s' not found in registry.", thread_name, scraper_name)
+        return None
 
-    find_url_func = SCRAPER_REGISTRY[scraper_name]['find']
-    scrape_func = SCRAPER_REGISTRY[scraper_name]['scrape']
     scraped_data = None
     target_url_result = None
 
     try:
+        scraper_funcs = _load_scraper(scraper_name) # Import errors are handled like any scraper failure
+        find_url_func = scraper_funcs['find']
+        scrape_func = scraper_funcs['scrape']
+
         # --- Find URL ---
         if scraper_name == "Javlibrary":
             target_url_result = find_url_func(movie_id, user_agent=user_agent_for_javlibrary, cf_clearance_token=cf_token_for_javlibrary)
@@ -783,8 +1035,8 @@ def run_single_scraper_task(scraper_name, movie_id,
             target_url_result = find_url_func(movie_id)
 
         if target_url_result == "CF_CHALLENGE":
-            logging.warning(f"[{thread_name}] Javlibrary CF Challenge during URL find for {movie_id}.")
-            return scraper_name, "CF_CHALLENGE" 
+            _log.warning("[%s] Javlibrary CF Challenge during URL find for %s.", thread_name, movie_id)
+            return "CF_CHALLENGE" 
 
         if target_url_result: 
             # --- Scrape Data ---
@@ -794,247 +1046,262 @@ def run_single_scraper_task(scraper_name, movie_id,
                 data_from_scraper = scrape_func(target_url_result)
 
             if data_from_scraper == "CF_CHALLENGE":
-                logging.warning(f"[{thread_name}] Javlibrary CF Challenge during scraping for {movie_id} from {target_url_result}.")
-                return scraper_name, "CF_CHALLENGE" 
+                _log.warning("[%s] Javlibrary CF Challenge during scraping for %s from %s.", thread_name, movie_id, target_url_result)
+                return "CF_CHALLENGE" 
 
             if data_from_scraper: 
                 data_from_scraper.pop('folder_url', None)
                 data_from_scraper.pop('folder_image_constructed_url', None)
                 scraped_data = data_from_scraper
-                print(f"[{thread_name}] Success: Scraped data found by {scraper_name}.")
+                _log.debug("[%s] Success: Scraped data found by %s.", thread_name, scraper_name)
             else:
-                print(f"[{thread_name}] Info: {scraper_name} scrape function returned no data for URL {target_url_result}.")
+                _log.debug("[%s] Info: %s scrape function returned no data for URL %s.", thread_name, scraper_name, target_url_result)
         else:
-            print(f"[{thread_name}] Info: No URL found by {scraper_name} for ID '{movie_id}'.")
+            _log.debug("[%s] Info: No URL found by %s for ID '%s'.", thread_name, scraper_name, movie_id)
 
     except Exception as e:
-        print(f"[{thread_name}] CRITICAL Error running {scraper_name} for '{movie_id}': {e}")
-        logging.exception(f"Exception in scraper task {scraper_name} for {movie_id}") # Log full traceback
+        _log.exception("[%s] Exception in scraper task %s for %s: %s", thread_name, scraper_name, movie_id, e) # Log full traceback
 
-    print(f"[{thread_name}] Task End: Scraper='{scraper_name}', Data Found={scraped_data is not None}")
-    return scraper_name, scraped_data
+    _log.debug("[%s] Task End: Scraper='%s', Data Found=%s", thread_name, scraper_name, scraped_data is not None)
+    return scraped_data
 # --- End Helper Function ---
 
 # --- Data Merging Function ---
+# Base set of keys expected by the rest of the app
+_ESSENTIAL_KEYS = frozenset({'id', 'content_id', 'title', 'title_raw', 'originaltitle',
+                             'description', 'release_date', 'release_year', 'runtime',
+                             'director', 'maker', 'label', 'series', 'genres',
+                             'actresses', 'cover_url', # Keep cover_url as it's the source for the poster
+                             'screenshot_urls', 'rating', 'votes', 'set', 'url',
+                             'folder_name', 'download_all', 'original_filepath', 'source'})
+_LIST_DEFAULT_KEYS = frozenset({'genres', 'actresses', 'screenshot_urls'}) # Missing keys that default to [] instead of None
+
 def merge_scraped_data(scraper_results, field_priorities):
     if not scraper_results:
-        print("Merging: No scraper results provided.")
+        _log.debug("Merging: No scraper results provided.")
         return {}, {} 
 
     final_data = {}
     final_data_sources = {} 
     processed_by_priority = set()
 
-    print("-" * 10, "Starting Data Merge", "-" * 10)
-    print(f"Received results from: {list(scraper_results.keys())}")
+    _log.debug("---------- Starting Data Merge ----------")
+    _log.debug("Received results from: %s", list(scraper_results))
+
+    # Single pass over the raw results: collect every key and decide validity
+    # (not None, not empty string/list/dict) once per (scraper, key) for both merge steps below
+    all_found_keys = set()
+    valid_by_scraper = {}
+    for scraper_name, data_dict in scraper_results.items():
+        if not data_dict: continue # Ensure scraper actually returned data
+        all_found_keys.update(data_dict)
+        valid_by_scraper[scraper_name] = {
+            key: value for key, value in data_dict.items()
+            if (bool(value) if isinstance(value, (list, dict)) else (value is not None and value != ''))
+        }
 
     # --- 1. Apply Field Priorities ---
-    # Iterate through the fields defined in settings.py for consistent order
+    # Keep the best-ranked valid value per prioritized field
+    best_by_field = {} # field -> (rank in priority list, scraper_name, value)
+    for scraper_name, valid_items in valid_by_scraper.items():
+        for field, value in valid_items.items():
+            if field not in _PRIORITY_FIELDS_SET: continue
+            priority_list = field_priorities.get(field) or ()
+            if scraper_name not in priority_list: continue
+            rank = priority_list.index(scraper_name)
+            if field not in best_by_field or rank < best_by_field[field][0]:
+                best_by_field[field] = (rank, scraper_name, value)
+
+    # Apply winners in the order defined in settings.py for consistent output
     # The list app_settings.PRIORITY_FIELDS_ORDERED should no longer contain 'folder_url'
     for field in app_settings.PRIORITY_FIELDS_ORDERED:
-        priority_list = field_priorities.get(field, [])
         processed_by_priority.add(field) 
-        found_value_for_field = False
-        for scraper_name in priority_list:
-            # Check if this scraper ran and has data for this field
-            if scraper_name in scraper_results and scraper_results[scraper_name]:
-                data_dict = scraper_results[scraper_name]
-                if field in data_dict:
-                    value = data_dict.get(field)
-                    # Check if value is considered valid (not None, not empty string/list/dict)
-                    is_valid = False
-                    if isinstance(value, (list, dict)): is_valid = bool(value)
-                    elif value is not None and value != '': is_valid = True
-
-                    if is_valid:
-                         if field == 'title':
-                             # For 'title' field, we want the processed title in final_data['title']
-                             # and the original, potentially prefixed title in final_data['title_raw']
-                             
-                             # 'value' here is data_dict.get('title'), which for Javlibrary is "Actual Title"
-                             processed_title_from_scraper = value 
-                             
-                             # 'title_raw' from the scraper (e.g., Javlibrary's "ID - Actual Title")
-                             # Fallback to the processed title if 'title_raw' isn't explicitly provided by the scraper.
-                             raw_title_from_scraper = data_dict.get('title_raw', processed_title_from_scraper) 
-
-                             final_data['title'] = processed_title_from_scraper
-                             final_data['title_raw'] = raw_title_from_scraper
-                             
-                             print(f"  Merging Field '{field}': SET 'title' to '{processed_title_from_scraper}' and 'title_raw' to '{raw_title_from_scraper}' using '{scraper_name}'.")
-                         else:
-                             final_data[field] = value
-                             print(f"  Merging Field '{field}': SET using '{scraper_name}'. Value: {value}")
-                         
-                         final_data_sources[field] = scraper_name
-                         found_value_for_field = True
-                         if 'source' not in final_data:
-                             final_data['source'] = data_dict.get('source', scraper_name.lower())
-                         break # Found best value for this field, move to next field
-                    # else: # Debugging if needed
-                    #     print(f"  Merging Field '{field}': IGNORING invalid value from '{scraper_name}': {value}")
-            # else: # Debugging if needed
-            #      print(f"  Merging Field '{field}': Scraper '{scraper_name}' not in results or has no data.")
-
-        if not found_value_for_field:
-             print(f"  Merging Field '{field}': No valid value found in priority list {priority_list}. Field will be missing or default later.")
+        best = best_by_field.get(field)
+        if best is not None:
+            _, scraper_name, value = best
+            data_dict = scraper_results[scraper_name]
+            if field == 'title':
+                # For 'title' field, we want the processed title in final_data['title']
+                # and the original, potentially prefixed title in final_data['title_raw']
+                
+                # 'value' here is data_dict.get('title'), which for Javlibrary is "Actual Title"
+                processed_title_from_scraper = value 
+                
+                # 'title_raw' from the scraper (e.g., Javlibrary's "ID - Actual Title")
+                # Fallback to the processed title if 'title_raw' isn't explicitly provided by the scraper.
+                raw_title_from_scraper = data_dict.get('title_raw', processed_title_from_scraper) 
+
+                final_data['title'] = processed_title_from_scraper
+                final_data['title_raw'] = raw_title_from_scraper
+                
+                _log.debug("  Merging Field '%s': SET 'title' to '%s' and 'title_raw' to '%s' using '%s'.", field, processed_title_from_scraper, raw_title_from_scraper, scraper_name)
+            else:
+                final_data[field] = value
+                _log.debug("  Merging Field '%s': SET using '%s'. Value: %s", field, scraper_name, value)
+            
+            final_data_sources[field] = scraper_name
+            if 'source' not in final_data:
+                final_data['source'] = data_dict.get('source', scraper_name.lower())
+        else:
+             _log.debug("  Merging Field '%s': No valid value found in priority list %s. Field will be missing or default later.", field, field_priorities.get(field, []))
              # Ensure key exists but is None/empty if no priority scraper had it
              if field == 'title': # Ensure both title and title_raw are handled
                  final_data['title'] = None
                  final_data['title_raw'] = None
              else:
                  # Adjusted default for non-list/dict fields
-                 final_data[field] = [] if field in ['genres', 'actresses', 'screenshot_urls'] else None
+                 final_data[field] = [] if field in _LIST_DEFAULT_KEYS else None
 
 
     # --- 2. Add Remaining Fields (Not explicitly prioritized) ---
     # Iterate through all scrapers that provided results
     # Use the order they appear in scraper_results
-    print("Processing remaining (non-prioritized) fields...")
-    all_found_keys = set()
-    for scraper_name, results_dict in scraper_results.items():
-         if results_dict: # Ensure scraper actually returned data
-             all_found_keys.update(results_dict.keys())
-             for key, value in results_dict.items():
-                  # If the key wasn't handled by priority logic AND isn't already in final_data
-                  # AND it's not the folder_url or constructed url we are ignoring
-                  if key not in processed_by_priority and key not in final_data \
-                     and key not in ['folder_url', 'folder_image_constructed_url']: 
-                      # Check if value is valid before adding
-                      is_valid = False
-                      if isinstance(value, (list, dict)): is_valid = bool(value)
-                      elif value is not None and value != '': is_valid = True
-
-                      if is_valid:
-                          final_data[key] = value
-                          final_data_sources[key] = scraper_name 
-                          print(f"  Adding Unprioritized Field '{key}': Using value from '{scraper_name}'. Value: {value}")
-                          processed_by_priority.add(key)
+    _log.debug("Processing remaining (non-prioritized) fields...")
+    for scraper_name, valid_items in valid_by_scraper.items():
+         for key, value in valid_items.items():
+              # If the key wasn't handled by priority logic AND isn't already in final_data
+              # AND it's not the folder_url or constructed url we are ignoring
+              if key not in processed_by_priority and key not in final_data \
+                 and key not in ['folder_url', 'folder_image_constructed_url']: 
+                  final_data[key] = value
+                  final_data_sources[key] = scraper_name 
+                  _log.debug("  Adding Unprioritized Field '%s': Using value from '%s'. Value: %s", key, scraper_name, value)
+                  processed_by_priority.add(key)
 
 
     # --- 3. Ensure Essential Keys Exist ---
-    # Define a base set of keys expected by the rest of the app
-    essential_keys = {'id', 'content_id', 'title', 'title_raw', 'originaltitle',
-                      'description', 'release_date', 'release_year', 'runtime',
-                      'director', 'maker', 'label', 'series', 'genres',
-                      'actresses', 'cover_url', # Keep cover_url as it's the source for the poster
-                      'screenshot_urls', 'rating', 'votes', 'set', 'url',
-                      'folder_name', 'download_all', 'original_filepath', 'source'}
-
     # Ensure all essential keys and any keys found during scraping are present
     # Remove folder_url and constructed url from consideration here too
-    all_expected_keys = essential_keys.union(
+    all_expected_keys = _ESSENTIAL_KEYS.union(
         k for k in all_found_keys if k not in ['folder_url', 'folder_image_constructed_url']
     )
 
-    print("Ensuring essential keys exist...")
+    _log.debug("Ensuring essential keys exist...")
     for key in all_expected_keys:
         if key not in final_data:
-             final_data[key] = [] if key in ['genres', 'actresses', 'screenshot_urls'] else None
-             print(f"  Adding missing essential key '{key}' with default value.")
+             final_data[key] = [] if key in _LIST_DEFAULT_KEYS else None
+             _log.debug("  Adding missing essential key '%s' with default value.", key)
     # Ensure source has a fallback if still missing
     if not final_data.get('source'): final_data['source'] = 'unknown'
     # Ensure title_raw has a fallback if somehow still missing
     if 'title_raw' not in final_data: final_data['title_raw'] = final_data.get('title')
 
-    print(f"Final Merged Data Keys: {list(final_data.keys())}")
-    print("-" * 10, "Finished Data Merge", "-" * 10)
+    _log.debug("Final Merged Data Keys: %s", list(final_data))
+    _log.debug("---------- Finished Data Merge ----------")
     return final_data, final_data_sources 
 # --- End Data Merging ---
 
 # --- Translation Helper Function ---
-def _run_translation_script(service, text, target_language, api_key=None):
-    if not service or service == "None":
-        return None
-    # Strip whitespace from text before checking if empty
-    text_to_translate = text.strip() if isinstance(text, str) else ""
-    if not text_to_translate:
-        logging.warning("Translation skipped: Input text is empty or only whitespace.")
-        return None
+@st.cache_resource
+def _get_translation_executor():
+    """Runs in-process translator calls so a hung API request can be abandoned after the timeout."""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="translate")
 
-    script_map = {
-        "Google": "translate_google.py",
-        "DeepL": "translate_deepl.py",
-        "DeepSeek": "translate_deepseek.py"
-    }
-    script_name = script_map.get(service)
-    if not script_name:
-        logging.error(f"Unknown translation service: {service}")
-        return None
-
-    script_path = os.path.join(os.path.dirname(__file__), script_name) 
-    if not os.path.exists(script_path):
-        logging.error(f"Translation script not found: {script_path}")
-        st.error(f"Translation script '{script_name}' not found.")
-        return None
-
-    cmd = [sys.executable, script_path, text_to_translate, target_language] 
-    if service in ["DeepL", "DeepSeek"]:
-        if not api_key:
-            logging.error(f"API key required for {service} but not provided.")
-            st.toast(f"⚠️ API Key missing for {service} translation.", icon="🔑")
-            return None
-        cmd.append(api_key)
+def _run_translation_batch(service, texts, target_language, api_key=None, executor=None, messages=None):
+    """
+    Translates several texts with one translator call where the service supports it (translate_batch).
+    Returns a list parallel to texts; entries are None for empty input or failed translations.
+    When run off the script thread, pass the translation executor and a messages list: warnings/errors are then
+    appended as (st function, text, icon) for the script thread to show, instead of calling st directly.
+    """
+    def notify(kind, text, icon=None):
+        if messages is None: getattr(st, kind)(text, icon=icon)
+        else: messages.append((kind, text, icon))
 
-    # Debug: Print the command being executed
-    print(f"--- DEBUG: Executing translation command: {' '.join(cmd)}")
+    results = [None] * len(texts)
+    if not service or service == "None":
+        return results
+    # Strip whitespace from text before checking if empty
+    texts_to_translate = [text.strip() if isinstance(text, str) else "" for text in texts]
+    if not any(texts_to_translate):
+        _log.warning("Translation skipped: Input text is empty or only whitespace.")
+        return results
+
+    module_name = TRANSLATION_MODULES.get(service)
+    if not module_name:
+        _log.error("Unknown translation service: %s", service)
+        return results
+
+    if service in API_KEY_TRANSLATORS and not api_key:
+        _log.error("API key required for %s but not provided.", service)
+        notify('toast', f"⚠️ API Key missing for {service} translation.", "🔑")
+        return results
+
+    pending_indices = []
+    for idx, text_to_translate in enumerate(texts_to_translate):
+        if not text_to_translate: continue
+        cached_translation = translation_cache.get(service, target_language, text_to_translate)
+        if cached_translation is not None:
+            _log.info("Translation cache hit (%s, %s): '%s...'", service, target_language, cached_translation[:50])
+            results[idx] = cached_translation
+        else:
+            pending_indices.append(idx)
+    if not pending_indices:
+        return results
 
-    logging.info(f"Running translation: Service='{service}', Lang='{target_language}', Text='{text_to_translate[:30]}...'")
-    translated_text = None
-    temp_file_path = None
     try:
-        # Set timeout to prevent hanging (e.g., 60 seconds)
-        timeout_seconds = 60
-        result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', check=False, timeout=timeout_seconds)
-
-        # Debug: Print script output
-        print(f"--- DEBUG: Translation script return code: {result.returncode}")
-        print(f"--- DEBUG: Translation script stdout:\n{result.stdout}")
-        print(f"--- DEBUG: Translation script stderr:\n{result.stderr}")
-
-
-        if result.returncode != 0:
-            error_message = result.stderr.strip() if result.stderr else f"Translation script '{script_name}' failed with exit code {result.returncode}."
-            logging.error(f"Translation Error ({service}): {error_message}")
-            st.toast(f"❌ Translation failed ({service}): {error_message[:100]}...", icon="💬")
-            return None
+        translator_module = importlib.import_module(module_name)
+    except ImportError as e: # Missing translator module or one of its dependencies
+        _log.error("Translation module '%s' could not be imported: %s", module_name, e)
+        notify('error', f"Translation module '{module_name}.py' could not be loaded: {e}")
+        return results
+
+    pending_texts = [texts_to_translate[idx] for idx in pending_indices]
+    batch_func = getattr(translator_module, 'translate_batch', None)
+    _log.info("Running translation: Service='%s', Lang='%s', Texts=%s, First='%s...'", service, target_language, len(pending_texts), pending_texts[0][:30])
+    if executor is None: executor = _get_translation_executor()
+    try:
+        if batch_func is not None and len(pending_texts) > 1:
+            future = executor.submit(batch_func, pending_texts, target_language, api_key)
         else:
-            temp_file_path = result.stdout.strip()
-            if not temp_file_path or not os.path.exists(temp_file_path):
-                error_message = f"Translation script '{script_name}' succeeded but did not return a valid temp file path (stdout: '{temp_file_path}')."
-                if result.stderr: error_message += f"\nStderr: {result.stderr.strip()}"
-                logging.error(error_message)
-                st.toast(f"❌ Translation error ({service}): Script output error.", icon="📄")
-                return None
-
-            # Read the content from the temp file
-            with open(temp_file_path, 'r', encoding='utf-8') as f:
-                translated_text = f.read()
-            logging.info(f"Translation successful ({service}). Translated Text: '{translated_text[:50]}...'")
-            return translated_text
-
-    except subprocess.TimeoutExpired:
-        logging.error(f"Translation ({service}) timed out after {timeout_seconds} seconds.")
-        st.toast(f"⏱️ Translation timed out ({service}).", icon="💬")
-        return None
-    except FileNotFoundError:
-        logging.error(f"Error: Python executable '{sys.executable}' or script '{script_path}' not found.")
-        st.error("Translation component error: Python or script not found.")
-        return None
+            future = executor.submit(lambda: [translator_module.translate(t, target_language, api_key) for t in pending_texts])
+        translated_texts = future.result(timeout=TRANSLATION_TIMEOUT_SECONDS)
+    except concurrent.futures.TimeoutError:
+        _log.error("Translation (%s) timed out after %s seconds.", service, TRANSLATION_TIMEOUT_SECONDS)
+        notify('toast', f"⏱️ Translation timed out ({service}).", "💬")
+        return results
     except Exception as e:
-        logging.error(f"Unexpected error running translation script ({service}): {e}")
-        st.toast(f"💥 Unexpected translation error ({service}). Check logs.", icon="💬")
-        return None
-    finally:
-        # Ensure temporary file is always deleted if path was obtained
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-                logging.debug(f"Successfully removed temp file: {temp_file_path}")
-            except OSError as e:
-                logging.error(f"Error removing temporary translation file '{temp_file_path}': {e}")
+        _log.error("Translation Error (%s): %s", service, e)
+        notify('toast', f"❌ Translation failed ({service}): {str(e)[:100]}...", "💬")
+        return results
+
+    if not translated_texts or len(translated_texts) != len(pending_texts):
+        _log.error("Translation Error (%s): translator returned no text.", service)
+        notify('toast', f"❌ Translation failed ({service}). Check logs.", "💬")
+        return results
+    for idx, text_to_translate, translated_text in zip(pending_indices, pending_texts, translated_texts):
+        if translated_text is None: continue
+        _log.info("Translation successful (%s). Translated Text: '%s...'", service, translated_text[:50])
+        translation_cache.put(service, target_language, text_to_translate, translated_text)
+        results[idx] = translated_text
+    return results
 # --- End Translation Helper ---
 
+# --- Movie Discovery Helpers ---
+def _find_movies_in_files(root, file_names, valid_extensions_lower):
+    """Returns (movie paths without a sibling .nfo, skipped count) for one directory's file names."""
+    found_paths, skipped = [], 0
+    name_set = {os.path.normcase(name) for name in file_names} # normcase: Movie.NFO matches on Windows, as os.path.exists did
+    _splitext = os.path.splitext; _normcase = os.path.normcase # Local names: this runs for every file in the tree
+    root_prefix = os.path.join(root, '') # Root with exactly one trailing separator; prefix + name == os.path.join(root, name)
+    for file_name in file_names:
+        filename_no_ext, ext = _splitext(file_name)
+        if ext.lower() in valid_extensions_lower:
+            if _normcase(filename_no_ext + ".nfo") in name_set:
+                skipped += 1
+            else:
+                found_paths.append(root_prefix + file_name)
+    return found_paths, skipped
+
+def _scan_movie_subtree(top, valid_extensions_lower):
+    """os.walk one subtree (run on a discovery worker thread); returns (movie paths, skipped .nfo count)."""
+    found_paths, skipped = [], 0
+    for root, _, files in os.walk(top):
+        root_paths, root_skipped = _find_movies_in_files(root, files, valid_extensions_lower)
+        found_paths.extend(root_paths)
+        skipped += root_skipped
+    return found_paths, skipped
+# ---
 
 # --- Callback Functions ---
 def process_input_dir_callback():
@@ -1044,32 +1311,35 @@ def process_input_dir_callback():
     st.session_state.last_crawl_was_recursive = recursive_scan_active
     final_input_dir = input_dir_from_state
 
+    _log.debug("[CRAWLER] Loading latest settings from file for callback...")
+    latest_settings = load_settings() # Read once; used for the default input dir and the crawl settings below
+
     if not input_dir_from_state:
-        print("[DEBUG CRAWLER] Input directory field is empty. Loading default from settings...")
-        latest_defaults_for_input = load_settings() # Assuming load_settings() defined
-        default_input_path = latest_defaults_for_input.get("input_dir", "").strip()
+        _log.debug("[CRAWLER] Input directory field is empty. Using default from settings...")
+        default_input_path = latest_settings.get("input_dir", "").strip()
         if default_input_path:
             final_input_dir = default_input_path
-            print(f"[DEBUG CRAWLER] Using default input directory from settings: {final_input_dir}")
+            _log.debug("[CRAWLER] Using default input directory from settings: %s", final_input_dir)
         else:
             st.error("Input Directory field empty and no default set.")
             return
     else:
-        print(f"[DEBUG CRAWLER] Using input directory from field: {final_input_dir}")
+        _log.debug("[CRAWLER] Using input directory from field: %s", final_input_dir)
 
     if not os.path.isdir(final_input_dir):
         st.error(f"Input Directory invalid: '{final_input_dir}'")
         return
 
-    print("[DEBUG CRAWLER] Loading latest settings from file for callback...")
-    latest_settings = load_settings() # Reload settings from JSON/defaults
-
     enabled_scrapers = latest_settings.get("enabled_scrapers", [])
     if not enabled_scrapers:
         st.error("No scrapers selected in Settings.")
         return
+    enabled_scrapers = _loadable_scrapers(enabled_scrapers) # Module found but e.g. lxml missing: warn here, not per task
+    if not enabled_scrapers:
+        st.error("None of the selected scrapers could be loaded. Check the installed requirements.")
+        return
     field_priorities = latest_settings.get("field_priorities", {})
-    print(f"[DEBUG CRAWLER] Using Enabled Scrapers: {enabled_scrapers}")
+    _log.debug("[CRAWLER] Using Enabled Scrapers: %s", enabled_scrapers)
 
         # --- Check if enabled scrapers are actually used in priorities ---
     all_scrapers_in_priority_lists = set()
@@ -1089,7 +1359,7 @@ def process_input_dir_callback():
             f"Please review your Field Priority settings."
         )
         st.warning(warning_message, icon="⚠️")
-        logging.warning(f"Unused enabled scrapers found: {unused_enabled_scrapers}. They are not in any priority list.")
+        _log.warning("Unused enabled scrapers found: %s. They are not in any priority list.", unused_enabled_scrapers)
     # --- END CHECK ---
 
     # --- Javlibrary Credentials Check ---
@@ -1113,7 +1383,7 @@ def process_input_dir_callback():
         if not target_language:
             st.warning("Translation enabled, but Target Language is not set.", icon="⚠️")
             translation_possible = False
-        if translator_service in ["DeepL", "DeepSeek"] and not api_key:
+        if translator_service in API_KEY_TRANSLATORS and not api_key:
             st.warning(f"Translation enabled for {translator_service}, but API Key is not set.", icon="🔑")
             translation_possible = False
     
@@ -1121,40 +1391,45 @@ def process_input_dir_callback():
     st.session_state.all_movie_data = {}
     st.session_state.current_movie_key = None
     st.session_state.movie_file_paths = []
+    all_movie_data = {} # Filled locally during the crawl, assigned to session state once afterwards
     processed_files = 0
     skipped_manual_entry = 0
     skipped_nfo_count = 0
-    valid_extensions_lower = ('.mp4', '.mkv', '.avi', '.wmv', '.mov') 
+    valid_extensions_lower = frozenset(('.mp4', '.mkv', '.avi', '.wmv', '.mov'))
     movie_files_to_process = []
     status_text_discovery = st.empty()
 
     try:
         if not recursive_scan_active:
             status_text_discovery.text(f"Scanning directory: {final_input_dir}...")
-            for item_name in os.listdir(final_input_dir):
-                item_path = os.path.join(final_input_dir, item_name)
-                if os.path.isfile(item_path):
-                    filename, ext = os.path.splitext(item_name)
-                    if ext.lower() in valid_extensions_lower:
-                        nfo_path = os.path.join(final_input_dir, filename + ".nfo")
-                        if os.path.exists(nfo_path):
-                            skipped_nfo_count += 1
-                            continue
-                        else:
-                            movie_files_to_process.append(item_path)
+            # One scandir pass; .nfo existence is a set lookup instead of a stat per movie file
+            with os.scandir(final_input_dir) as it:
+                entries = list(it)
+            entry_names = {os.path.normcase(entry.name) for entry in entries} # normcase: Movie.NFO matches on Windows
+            for entry in entries:
+                filename, ext = os.path.splitext(entry.name)
+                if ext.lower() in valid_extensions_lower and entry.is_file():
+                    if os.path.normcase(filename + ".nfo") in entry_names:
+                        skipped_nfo_count += 1
+                        continue
+                    else:
+                        movie_files_to_process.append(entry.path)
         else:
-            for root, _, files in os.walk(final_input_dir):
-                status_text_discovery.text(f"Scanning directory: {root}...")
-                for file_name in files:
-                    file_path = os.path.join(root, file_name)
-                    filename_no_ext, ext = os.path.splitext(file_name)
-                    if ext.lower() in valid_extensions_lower:
-                        nfo_path = os.path.join(root, filename_no_ext + ".nfo")
-                        if os.path.exists(nfo_path):
-                            skipped_nfo_count += 1
-                            continue
-                        else:
-                            movie_files_to_process.append(file_path)
+            status_text_discovery.text(f"Scanning directory: {final_input_dir}...")
+            # Same split as os.walk (symlinked dirs are listed but not followed); each subtree is walked on its own thread
+            with os.scandir(final_input_dir) as it:
+                entries = list(it)
+            top_files = [entry.name for entry in entries if not entry.is_dir()]
+            subdirs = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+            movie_files_to_process, skipped_nfo_count = _find_movies_in_files(final_input_dir, top_files, valid_extensions_lower)
+            if subdirs:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(16, len(subdirs)), thread_name_prefix="discovery") as discovery_executor:
+                    future_to_subdir = {discovery_executor.submit(_scan_movie_subtree, subdir, valid_extensions_lower): subdir for subdir in subdirs}
+                    for done_count, future in enumerate(concurrent.futures.as_completed(future_to_subdir), start=1):
+                        subtree_paths, subtree_skipped = future.result()
+                        movie_files_to_process.extend(subtree_paths)
+                        skipped_nfo_count += subtree_skipped
+                        status_text_discovery.text(f"Scanned {done_count}/{len(subdirs)} folders: {future_to_subdir[future]}")
         status_text_discovery.text("Finished scanning directories.")
     except OSError as e:
         st.error(f"Error scanning Input Directory '{final_input_dir}': {e}")
@@ -1174,39 +1449,62 @@ def process_input_dir_callback():
     progress_bar = st.progress(0)
     status_text = st.empty()
     default_download_state = latest_settings.get('default_download_all_initial_state', False) 
-    max_workers = min(len(enabled_scrapers), os.cpu_count() + 4 if len(enabled_scrapers) > 1 else 1)
 
     # Get Javlibrary credentials from session state
     current_jl_user_agent = st.session_state.get("javlibrary_user_agent")
     current_jl_cf_token = st.session_state.get("javlibrary_cf_token")
     javlibrary_globally_failed_this_run = False 
+    prefetched_scraper_futures = {} # filepath -> {future: scraper name} for the next movie's first attempt (submitted one movie ahead)
+
+    # Status/progress pushes are coalesced to at most 10 per second; the latest values are kept and sent on the next push
+    last_ui_update = 0.0
+    pending_status_text = None
+    pending_progress = None
+    def update_crawl_ui(status=None, progress=None, force=False):
+        nonlocal last_ui_update, pending_status_text, pending_progress
+        if status is not None: pending_status_text = status
+        if progress is not None: pending_progress = progress
+        now = time.monotonic()
+        if not force and now - last_ui_update < 0.1: return
+        last_ui_update = now
+        if pending_status_text is not None:
+            status_text.text(pending_status_text)
+            pending_status_text = None
+        if pending_progress is not None:
+            progress_bar.progress(pending_progress)
+            pending_progress = None
+
+    # --- Helper functions for running scraper tasks ---
+    def submit_scraper_tasks(id_to_scrape, current_jl_ua, current_jl_cf, enabled_scrapers_list):
+        executor = _get_scraper_executor()
+        _futures = {} # future -> scraper name
+        for scraper_name_iter in enabled_scrapers_list:
+            ua_for_jl_iter = current_jl_ua if scraper_name_iter == "Javlibrary" else None
+            cf_for_jl_iter = current_jl_cf if scraper_name_iter == "Javlibrary" else None
+            
+            future_iter = executor.submit(run_single_scraper_task, scraper_name_iter, id_to_scrape,
+                                        user_agent_for_javlibrary=ua_for_jl_iter,
+                                        cf_token_for_javlibrary=cf_for_jl_iter)
+            _futures[future_iter] = scraper_name_iter
+        return _futures
 
-    # --- Helper function for running scraper tasks ---
-    def execute_scraper_tasks(id_to_scrape, current_jl_ua, current_jl_cf, enabled_scrapers_list, max_workers_count, current_filename_base_for_status, current_progress_tuple_for_status):
+    def execute_scraper_tasks(id_to_scrape, current_jl_ua, current_jl_cf, enabled_scrapers_list, current_filename_base_for_status, current_progress_tuple_for_status, submitted_futures=None):
         nonlocal javlibrary_globally_failed_this_run # Allow modification of the outer scope variable
         # No need to pass st or st.session_state, can access them directly if needed from outer scope.
 
         _scraper_results = {}
         _any_success = False
-        _futures = []
 
-        status_text.text(f"Processing: {current_filename_base_for_status} (ID: {id_to_scrape}) ({current_progress_tuple_for_status[0]}/{current_progress_tuple_for_status[1]}) - Running scrapers...")
+        update_crawl_ui(status=f"Processing: {current_filename_base_for_status} (ID: {id_to_scrape}) ({current_progress_tuple_for_status[0]}/{current_progress_tuple_for_status[1]}) - Running scrapers...")
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers_count) as executor:
-            for scraper_name_iter in enabled_scrapers_list:
-                ua_for_jl_iter = current_jl_ua if scraper_name_iter == "Javlibrary" else None
-                cf_for_jl_iter = current_jl_cf if scraper_name_iter == "Javlibrary" else None
-                
-                future_iter = executor.submit(run_single_scraper_task, scraper_name_iter, id_to_scrape,
-                                            user_agent_for_javlibrary=ua_for_jl_iter,
-                                            cf_token_for_javlibrary=cf_for_jl_iter)
-                _futures.append(future_iter)
+        _futures = submitted_futures if submitted_futures is not None else submit_scraper_tasks(id_to_scrape, current_jl_ua, current_jl_cf, enabled_scrapers_list)
         
-        status_text.text(f"Processing: {current_filename_base_for_status} (ID: {id_to_scrape}) ({current_progress_tuple_for_status[0]}/{current_progress_tuple_for_status[1]}) - Waiting for scrapers...")
+        update_crawl_ui(status=f"Processing: {current_filename_base_for_status} (ID: {id_to_scrape}) ({current_progress_tuple_for_status[0]}/{current_progress_tuple_for_status[1]}) - Waiting for scrapers...")
         
         for future_iter_done in concurrent.futures.as_completed(_futures):
             try:
-                name_res, data_res = future_iter_done.result()
+                name_res = _futures[future_iter_done]
+                data_res = future_iter_done.result()
                 if name_res == "Javlibrary" and data_res == "CF_CHALLENGE":
                     st.error(f"Javlibrary credentials failed for ID '{id_to_scrape}' (Cloudflare Challenge). You will be prompted again on the next 'Run Crawlers' attempt if Javlibrary remains enabled.", icon="🚨")
                     st.session_state.javlibrary_creds_provided_this_session = False 
@@ -1217,50 +1515,226 @@ def process_input_dir_callback():
                     for f_to_cancel_iter in _futures: # Cancel other pending futures for this ID
                         if not f_to_cancel_iter.done():
                             f_to_cancel_iter.cancel()
+                    for prefetched_futures in prefetched_scraper_futures.values(): # ...and the movie queued ahead
+                        for f_to_cancel_iter in prefetched_futures: f_to_cancel_iter.cancel()
+                    prefetched_scraper_futures.clear()
                     break # Break from processing results for this ID as JavLib is critical path for this attempt
 
                 if data_res and data_res != "CF_CHALLENGE":
                     _scraper_results[name_res] = data_res
                     _any_success = True
             except concurrent.futures.CancelledError:
-                print(f"A scraper task was cancelled for {current_filename_base_for_status} (ID: {id_to_scrape}).")
+                _log.info("A scraper task was cancelled for %s (ID: %s).", current_filename_base_for_status, id_to_scrape)
             except Exception as exc_res:
-                print(f"Error retrieving result from future for ID {id_to_scrape}: {exc_res}")
+                _log.error("Error retrieving result from future for ID %s: %s", id_to_scrape, exc_res)
         
         return _scraper_results, _any_success
-    # --- End Helper function ---
+    # --- Helper functions for the final stage (translation results, blacklist, naming) ---
+    genre_blacklist_set = frozenset(st.session_state.get("genre_blacklist", [])) # Stored lowercased and stripped; read once per crawl
+    pending_movies = collections.deque() # (finalize_movie_data args, [(translation future, index)] per task), in crawl order
+    inflight_translations = {} # Source text -> (future, index in its batch); identical texts are translated once per crawl
+    # keep_original_description is fixed for the whole crawl, so pick the description combiner once
+    combine_translated_description = (
+        (lambda translated, original: f"{translated}\n\n{original}" if original else translated)
+        if keep_orig_desc_flag else (lambda translated, original: translated)
+    )
+
+    def finalize_movie_data(filepath, merged_data, field_sources, translation_tasks, original_filename_base_for_nfo, id_used_for_successful_scrape, translated_texts):
+        if translated_texts:
+            # Capture original description before modification by translation
+            original_description_for_translation = merged_data.get('description')
+            translated_results_map = {
+                task['field']: translated_text
+                for task, translated_text in zip(translation_tasks, translated_texts)
+                if translated_text is not None # Check if the translator returned something
+            }
+
+            # Apply successful translations
+            if 'title' in translated_results_map:
+                merged_data['title'] = translated_results_map['title']
+            
+            if 'description' in translated_results_map:
+                merged_data['description'] = combine_translated_description(translated_results_map['description'], original_description_for_translation)
+
+        # --- GENRE BLACKLIST ---
+        current_genre_blacklist_lc = genre_blacklist_set
+        
+        if current_genre_blacklist_lc and \
+            'genres' in merged_data and \
+            isinstance(merged_data['genres'], list) and \
+            merged_data['genres']: 
+        
+            original_genres_for_movie = merged_data['genres']
+            filtered_movie_genres = [
+                genre_item 
+                for genre_item in original_genres_for_movie 
+                if isinstance(genre_item, str) and \
+                    (stripped_genre := genre_item.strip()) and \
+                    stripped_genre.lower() not in current_genre_blacklist_lc
+            ]
+            
+            if len(filtered_movie_genres) < len(original_genres_for_movie):
+                _log.info("[GENRE_BLACKLIST] ID '%s': Removed %s. Original: %s, Filtered: %s", id_used_for_successful_scrape,
+                          len(original_genres_for_movie) - len(filtered_movie_genres), original_genres_for_movie, filtered_movie_genres)
+            
+            merged_data['genres'] = filtered_movie_genres
+        # --- GENRE BLACKLIST BLOCK ---
 
 
+# --- Final Data Preparation ---
+        merged_data['_original_filename_base'] = original_filename_base_for_nfo
+        merged_data['id'] = id_used_for_successful_scrape # Use the ID that resulted in success
+        merged_data['original_filepath'] = filepath
+        merged_data['download_all'] = default_download_state
+        merged_data['_field_sources'] = field_sources
+        merged_data['_contributing_scrapers'] = tuple(sorted(set(field_sources.values())))
+        
+# --- Apply Naming Conventions ---
+        # 1. Prepare data for placeholder substitution
+        base_title_for_patterns = merged_data.get('title') or merged_data.get('title_raw') or 'NO_TITLE'
+        current_id_for_patterns = merged_data.get('id', 'NO_ID')
+        
+        semantic_title_for_patterns = base_title_for_patterns
+        # Strip ID prefix if present (e.g., from Javlibrary title) for a 'cleaner' semantic title
+        # This ensures {title} in patterns refers to the movie's actual title, not "ID - Title"
+        temp_id_prefix_for_strip1 = f"[{current_id_for_patterns}]" # Check for [ID] Title
+        temp_id_prefix_for_strip2 = f"{current_id_for_patterns} -" # Check for ID - Title
+        
+        if _startswith_ci(semantic_title_for_patterns, temp_id_prefix_for_strip1):
+            semantic_title_for_patterns = semantic_title_for_patterns[len(temp_id_prefix_for_strip1):].lstrip(" -").strip()
+        elif _startswith_ci(semantic_title_for_patterns, temp_id_prefix_for_strip2):
+             # More robustly find where the title starts after "ID - "
+            match = re.match(re.escape(current_id_for_patterns) + r'\s*-\s*(.*)', semantic_title_for_patterns, re.IGNORECASE)
+            if match:
+                semantic_title_for_patterns = match.group(1).strip()
+        
+        if not semantic_title_for_patterns: semantic_title_for_patterns = 'NO_TITLE'
+
+        actresses_list_for_pattern = merged_data.get('actresses', [])
+        first_actress_name_for_pattern = ""
+        if actresses_list_for_pattern and isinstance(actresses_list_for_pattern[0], dict):
+            first_actress_name_for_pattern = actresses_list_for_pattern[0].get('name', '')
+
+
+        placeholder_data = {
+            'id': current_id_for_patterns,
+            'content_id': merged_data.get('content_id', current_id_for_patterns),
+            'title': semantic_title_for_patterns, 
+            'original_title': merged_data.get('originaltitle', ''), # originaltitle is usually from scraper directly
+            'year': str(merged_data.get('release_year', '')),
+            'studio': merged_data.get('maker', ''),
+            'original_filename_base': merged_data.get('_original_filename_base', ''),
+            'actresses': actresses_list_for_pattern # Pass the list for format_string_with_placeholders
+        }
+
+        # 2. Generate Folder Name using pattern
+        folder_name_pattern_from_settings = st.session_state.get("naming_folder_name_pattern", app_settings.DEFAULT_NAMING_FOLDER_NAME_PATTERN)
+        raw_folder_name = format_string_with_placeholders(folder_name_pattern_from_settings, placeholder_data)
+        
+        # Sanitize the raw pattern output first
+        temp_folder_name = sanitize_filename(raw_folder_name) 
+        
+        final_folder_name_for_data = temp_folder_name # Default to non-truncated
+        
+        max_folder_len = 150 # This should ideally be a system-aware max path component length or a safe value
+        
+        if len(temp_folder_name) > max_folder_len:
+            # Perform truncation. The ellipsis is for visual representation if displayed,
+            # but sanitize_filename will ultimately clean it for path safety.
+            safe_truncate_point = max(0, max_folder_len - 3) # Ensure space for "..."
+            truncated_name_with_ellipsis = temp_folder_name[:safe_truncate_point] + "..."
+            
+            # Sanitize AGAIN after adding ellipsis. This is critical.
+            # This ensures "..." becomes "." and then is stripped by sanitize_filename's strip(' .')
+            final_folder_name_for_data = sanitize_filename(truncated_name_with_ellipsis)
+        
+        # Ensure there's a non-empty folder name after all sanitization
+        if not final_folder_name_for_data:
+            # Fallback to a sanitized ID or a generic name if ID is also problematic
+            fallback_name = placeholder_data.get('id', 'movie_folder') # Use ID as a good fallback
+            if not fallback_name: fallback_name = 'movie_folder' # Absolute fallback if ID was empty
+            final_folder_name_for_data = sanitize_filename(fallback_name)
+            # If even the sanitized ID is empty (e.g. ID was just "."), use a hardcoded name
+            if not final_folder_name_for_data: final_folder_name_for_data = "untitled_movie" 
+
+        merged_data['folder_name'] = final_folder_name_for_data
+        
+        # 3. Generate NFO Title using pattern (This part should be fine)
+        nfo_title_pattern_from_settings = st.session_state.get("naming_nfo_title_pattern", app_settings.DEFAULT_NAMING_NFO_TITLE_PATTERN)
+        merged_data['title'] = format_string_with_placeholders(nfo_title_pattern_from_settings, placeholder_data)
+        
+        # Ensure title_raw has a fallback.
+        if 'title_raw' not in merged_data or not merged_data.get('title_raw'):
+            merged_data['title_raw'] = merged_data.get('originaltitle', semantic_title_for_patterns if semantic_title_for_patterns != 'NO_TITLE' else "")
+        
+        all_movie_data[filepath] = merged_data
+
+    def finalize_ready_movies(wait=False):
+        # Finalize from the front of the queue so movies are completed in crawl order
+        while pending_movies and (wait or all(future.done() for future, _, _ in pending_movies[0][1])):
+            finalize_args, translation_refs = pending_movies.popleft()
+            translated_texts = []
+            for translation_future, batch_index, batch_messages in translation_refs:
+                try:
+                    translated_texts.append(translation_future.result()[batch_index])
+                except Exception as e:
+                    _log.error("Error during translation for '%s': %s", os.path.basename(finalize_args[0]), e)
+                    translated_texts.append(None)
+                # A batch's messages are complete once its future is done; show them once, with its first movie
+                for message_kind, message_text, message_icon in batch_messages:
+                    getattr(st, message_kind)(message_text, icon=message_icon)
+                batch_messages.clear()
+            finalize_movie_data(*finalize_args, translated_texts)
+    # --- End Helper functions ---
+
+
+    movie_id_cache = {} # filepath -> (file name, raw ID, sanitized ID); each path is looked at twice (lookahead, then its own turn)
+    def movie_ids_for(movie_filepath):
+        ids = movie_id_cache.pop(movie_filepath, None)
+        if ids is None:
+            movie_filename = os.path.basename(movie_filepath)
+            movie_raw_id = os.path.splitext(movie_filename)[0]
+            ids = (movie_filename, movie_raw_id, sanitize_id_for_scraper(movie_raw_id))
+            movie_id_cache[movie_filepath] = ids
+        return ids
+
+    translation_stage_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="translate_stage")
+    translation_executor = _get_translation_executor() # cache_resource lookup needs the script thread; the stage workers get it passed in
     with st.spinner(f"Processing {total_files} movie files..."):
         for i, filepath in enumerate(st.session_state.movie_file_paths):
             if javlibrary_globally_failed_this_run:
                 status_text.text("Javlibrary credential failure. Halting further movie processing for this run.")
                 break 
 
-            filename_base = os.path.basename(filepath)
-            raw_movie_id_from_filename = os.path.splitext(filename_base)[0]
+            filename_base, raw_movie_id_from_filename, sanitized_movie_id = movie_ids_for(filepath)
             original_filename_base_for_nfo = raw_movie_id_from_filename
-            
-            sanitized_movie_id = sanitize_id_for_scraper(raw_movie_id_from_filename) 
 
             if not sanitized_movie_id: # If sanitize_id_for_scraper returns None or empty
                  st.warning(f"Could not derive a valid ID from filename '{filename_base}', skipping file.")
                  # skipped_manual_entry += 1 # Not a manual entry yet, just a skip.
-                 progress_bar.progress((i + 1) / total_files)
+                 update_crawl_ui(progress=(i + 1) / total_files)
                  continue
 
             scraper_results = {}
             any_scraper_succeeded_for_this_movie = False
             id_used_for_successful_scrape = None
+
+            # Queue the next movie's first attempt now, so its scrapers run while this movie is awaited, merged and translated
+            this_movie_futures = prefetched_scraper_futures.pop(filepath, None)
+            if i + 1 < total_files:
+                next_filepath = st.session_state.movie_file_paths[i + 1]
+                next_sanitized_id = movie_ids_for(next_filepath)[2]
+                if next_sanitized_id:
+                    prefetched_scraper_futures[next_filepath] = submit_scraper_tasks(next_sanitized_id, current_jl_user_agent, current_jl_cf_token, enabled_scrapers)
             
             # --- ATTEMPT 1: Using Sanitized ID ---
             attempt1_results, attempt1_success = execute_scraper_tasks(
-                sanitized_movie_id, current_jl_user_agent, current_jl_cf_token, enabled_scrapers, max_workers,
-                filename_base, (i+1, total_files) 
+                sanitized_movie_id, current_jl_user_agent, current_jl_cf_token, enabled_scrapers,
+                filename_base, (i+1, total_files), submitted_futures=this_movie_futures
             )
             
             if javlibrary_globally_failed_this_run: # Check immediately after helper returns
-                progress_bar.progress((i + 1) / total_files)
+                update_crawl_ui(progress=(i + 1) / total_files)
                 continue # Skip to next movie file if JavLib globally failed during this attempt
 
             if attempt1_success:
@@ -1274,12 +1748,12 @@ def process_input_dir_callback():
                not javlibrary_globally_failed_this_run: # Ensure no global failure before trying again
 
                 attempt2_results, attempt2_success = execute_scraper_tasks(
-                    raw_movie_id_from_filename, current_jl_user_agent, current_jl_cf_token, enabled_scrapers, max_workers,
+                    raw_movie_id_from_filename, current_jl_user_agent, current_jl_cf_token, enabled_scrapers,
                     filename_base, (i+1, total_files) 
                 )
 
                 if javlibrary_globally_failed_this_run: # Check again
-                    progress_bar.progress((i + 1) / total_files)
+                    update_crawl_ui(progress=(i + 1) / total_files)
                     continue 
 
                 if attempt2_success:
@@ -1289,11 +1763,12 @@ def process_input_dir_callback():
             
             # --- Merging and Translation (only if no global CF fail and some scraper succeeded) ---
             if not javlibrary_globally_failed_this_run and any_scraper_succeeded_for_this_movie:
-                status_text.text(f"Processing: {filename_base} (ID: {id_used_for_successful_scrape}) ({i+1}/{total_files}) - Merging data...")
+                update_crawl_ui(status=f"Processing: {filename_base} (ID: {id_used_for_successful_scrape}) ({i+1}/{total_files}) - Merging data...")
                 merged_data, field_sources = merge_scraped_data(scraper_results, field_priorities) 
 
+                translation_tasks = []
+                translation_refs = []
                 if translation_enabled and translation_possible:
-                    translation_tasks = []
                     # Capture original texts before potential modification by translation
                     original_title_for_translation = merged_data.get('title')
                     original_description_for_translation = merged_data.get('description')
@@ -1306,156 +1781,23 @@ def process_input_dir_callback():
 
                     if translation_tasks:
                         status_parts = [task['field'].capitalize() for task in translation_tasks]
-                        status_text.text(f"{filename_base} ({i+1}/{total_files}) - Translating { ' & '.join(status_parts) }...")
+                        update_crawl_ui(status=f"{filename_base} ({i+1}/{total_files}) - Translating { ' & '.join(status_parts) }...")
                         
-                        translated_results_map = {}
-                        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(translation_tasks), 2)) as translator_executor:
-                            future_to_task_field = {
-                                translator_executor.submit(
-                                    _run_translation_script,
-                                    translator_service,
-                                    task['text'],
-                                    target_language,
-                                    api_key
-                                ): task['field']
-                                for task in translation_tasks
-                            }
-                            for future in concurrent.futures.as_completed(future_to_task_field):
-                                field_name = future_to_task_field[future]
-                                try:
-                                    translated_text = future.result()
-                                    if translated_text is not None: # Check if translation script returned something
-                                        translated_results_map[field_name] = translated_text
-                                except Exception as e:
-                                    logging.error(f"Error during {field_name} translation for '{filename_base}': {e}")
-                                    st.toast(f"⚠️ {field_name.capitalize()} translation failed for '{filename_base}'.", icon="💬")
-                        
-                        # Apply successful translations
-                        if 'title' in translated_results_map:
-                            merged_data['title'] = translated_results_map['title']
-                        
-                        if 'description' in translated_results_map:
-                            translated_desc = translated_results_map['description']
-                            if keep_orig_desc_flag and original_description_for_translation:
-                                merged_data['description'] = f"{translated_desc}\n\n{original_description_for_translation}"
-                            else:
-                                merged_data['description'] = translated_desc
-                        pass
-
-                # --- GENRE BLACKLIST ---
-                current_genre_blacklist_lc = st.session_state.get("genre_blacklist", []) 
-                
-                if current_genre_blacklist_lc and \
-                    'genres' in merged_data and \
-                    isinstance(merged_data['genres'], list) and \
-                    merged_data['genres']: 
-                
-                    original_genres_for_movie = merged_data['genres']
-                    filtered_movie_genres = [
-                        genre_item 
-                        for genre_item in original_genres_for_movie 
-                        if isinstance(genre_item, str) and \
-                            genre_item.strip() and \
-                            genre_item.strip().lower() not in current_genre_blacklist_lc
-                    ]
-                    
-                    if len(filtered_movie_genres) < len(original_genres_for_movie):
-                        removed_count = len(original_genres_for_movie) - len(filtered_movie_genres)
-                        log_msg = (f"[GENRE_BLACKLIST] ID '{id_used_for_successful_scrape}': Removed {removed_count}. "
-                                    f"Original: {original_genres_for_movie}, Filtered: {filtered_movie_genres}")
-                        logging.info(log_msg) 
-                    
-                    merged_data['genres'] = filtered_movie_genres
-                # --- GENRE BLACKLIST BLOCK ---
-
-
-# --- Final Data Preparation ---
-                merged_data['_original_filename_base'] = original_filename_base_for_nfo
-                merged_data['id'] = id_used_for_successful_scrape # Use the ID that resulted in success
-                merged_data['original_filepath'] = filepath
-                merged_data['download_all'] = default_download_state
-                merged_data['_field_sources'] = field_sources
-                
-# --- Apply Naming Conventions ---
-                # 1. Prepare data for placeholder substitution
-                base_title_for_patterns = merged_data.get('title') or merged_data.get('title_raw') or 'NO_TITLE'
-                current_id_for_patterns = merged_data.get('id', 'NO_ID')
-                
-                semantic_title_for_patterns = base_title_for_patterns
-                # Strip ID prefix if present (e.g., from Javlibrary title) for a 'cleaner' semantic title
-                # This ensures {title} in patterns refers to the movie's actual title, not "ID - Title"
-                temp_id_prefix_for_strip1 = f"[{current_id_for_patterns}]" # Check for [ID] Title
-                temp_id_prefix_for_strip2 = f"{current_id_for_patterns} -" # Check for ID - Title
-                
-                if semantic_title_for_patterns.lower().startswith(temp_id_prefix_for_strip1.lower()):
-                    semantic_title_for_patterns = semantic_title_for_patterns[len(temp_id_prefix_for_strip1):].lstrip(" -").strip()
-                elif semantic_title_for_patterns.lower().startswith(temp_id_prefix_for_strip2.lower()):
-                     # More robustly find where the title starts after "ID - "
-                    match = re.match(re.escape(current_id_for_patterns) + r'\s*-\s*(.*)', semantic_title_for_patterns, re.IGNORECASE)
-                    if match:
-                        semantic_title_for_patterns = match.group(1).strip()
-                
-                if not semantic_title_for_patterns: semantic_title_for_patterns = 'NO_TITLE'
-
-                actresses_list_for_pattern = merged_data.get('actresses', [])
-                first_actress_name_for_pattern = ""
-                if actresses_list_for_pattern and isinstance(actresses_list_for_pattern[0], dict):
-                    first_actress_name_for_pattern = actresses_list_for_pattern[0].get('name', '')
-
-
-                placeholder_data = {
-                    'id': current_id_for_patterns,
-                    'content_id': merged_data.get('content_id', current_id_for_patterns),
-                    'title': semantic_title_for_patterns, 
-                    'original_title': merged_data.get('originaltitle', ''), # originaltitle is usually from scraper directly
-                    'year': str(merged_data.get('release_year', '')),
-                    'studio': merged_data.get('maker', ''),
-                    'original_filename_base': merged_data.get('_original_filename_base', ''),
-                    'actresses': actresses_list_for_pattern # Pass the list for format_string_with_placeholders
-                }
-
-                # 2. Generate Folder Name using pattern
-                folder_name_pattern_from_settings = st.session_state.get("naming_folder_name_pattern", app_settings.DEFAULT_NAMING_FOLDER_NAME_PATTERN)
-                raw_folder_name = format_string_with_placeholders(folder_name_pattern_from_settings, placeholder_data)
-                
-                # Sanitize the raw pattern output first
-                temp_folder_name = sanitize_filename(raw_folder_name) 
-                
-                final_folder_name_for_data = temp_folder_name # Default to non-truncated
-                
-                max_folder_len = 150 # This should ideally be a system-aware max path component length or a safe value
-                
-                if len(temp_folder_name) > max_folder_len:
-                    # Perform truncation. The ellipsis is for visual representation if displayed,
-                    # but sanitize_filename will ultimately clean it for path safety.
-                    safe_truncate_point = max(0, max_folder_len - 3) # Ensure space for "..."
-                    truncated_name_with_ellipsis = temp_folder_name[:safe_truncate_point] + "..."
-                    
-                    # Sanitize AGAIN after adding ellipsis. This is critical.
-                    # This ensures "..." becomes "." and then is stripped by sanitize_filename's strip(' .')
-                    final_folder_name_for_data = sanitize_filename(truncated_name_with_ellipsis)
-                
-                # Ensure there's a non-empty folder name after all sanitization
-                if not final_folder_name_for_data:
-                    # Fallback to a sanitized ID or a generic name if ID is also problematic
-                    fallback_name = placeholder_data.get('id', 'movie_folder') # Use ID as a good fallback
-                    if not fallback_name: fallback_name = 'movie_folder' # Absolute fallback if ID was empty
-                    final_folder_name_for_data = sanitize_filename(fallback_name)
-                    # If even the sanitized ID is empty (e.g. ID was just "."), use a hardcoded name
-                    if not final_folder_name_for_data: final_folder_name_for_data = "untitled_movie" 
-
-                merged_data['folder_name'] = final_folder_name_for_data
-                
-                # 3. Generate NFO Title using pattern (This part should be fine)
-                nfo_title_pattern_from_settings = st.session_state.get("naming_nfo_title_pattern", app_settings.DEFAULT_NAMING_NFO_TITLE_PATTERN)
-                merged_data['title'] = format_string_with_placeholders(nfo_title_pattern_from_settings, placeholder_data)
-                
-                # Ensure title_raw has a fallback.
-                if 'title_raw' not in merged_data or not merged_data.get('title_raw'):
-                    merged_data['title_raw'] = merged_data.get('originaltitle', semantic_title_for_patterns if semantic_title_for_patterns != 'NO_TITLE' else "")
-                
-                st.session_state.all_movie_data[filepath] = merged_data
+                        # Texts already submitted earlier in this crawl (studio boilerplate, repeated titles) reuse that future
+                        new_texts = list(dict.fromkeys(task['text'] for task in translation_tasks if task['text'] not in inflight_translations))
+                        if new_texts:
+                            # One translator call for the new texts, run in the background so the
+                            # loop can move on to the next movie's scrapers; the result is applied in finalize_movie_data
+                            batch_messages = [] # Shown by finalize_ready_movies on the script thread
+                            translation_future = translation_stage_executor.submit(
+                                _run_translation_batch, translator_service, new_texts, target_language, api_key, translation_executor, batch_messages
+                            )
+                            for batch_index, text in enumerate(new_texts):
+                                inflight_translations[text] = (translation_future, batch_index, batch_messages)
+                        translation_refs = [inflight_translations[task['text']] for task in translation_tasks]
+                pending_movies.append(((filepath, merged_data, field_sources, translation_tasks, original_filename_base_for_nfo, id_used_for_successful_scrape), translation_refs))
                 processed_files += 1
+                finalize_ready_movies()
             elif not javlibrary_globally_failed_this_run: # No scraper succeeded (after all attempts), but also no global CF fail
                  # Use the sanitized_movie_id for manual entry consistency
                  id_for_manual_entry = sanitized_movie_id 
@@ -1479,13 +1821,22 @@ def process_input_dir_callback():
                      'original_filepath': filepath,
                      'download_all': default_download_state,
                      '_field_sources': {},
+                     '_contributing_scrapers': (),
                      'folder_name': format_and_truncate_folder_name(id_for_manual_entry, "", "")
                  }
-                 st.session_state.all_movie_data[filepath] = manual_data
+                 all_movie_data[filepath] = manual_data
                  processed_files += 1
                  skipped_manual_entry += 1
 
-            progress_bar.progress((i + 1) / total_files)
+            update_crawl_ui(progress=(i + 1) / total_files)
+
+        update_crawl_ui(force=True) # Flush the last coalesced status/progress
+        # Wait for translations still in flight, then store in crawl order (manual entries are stored immediately)
+        if pending_movies:
+            status_text.text(f"Finishing translations for {len(pending_movies)} movie(s)...")
+        finalize_ready_movies(wait=True)
+        translation_stage_executor.shutdown()
+        st.session_state.all_movie_data = {fp: all_movie_data[fp] for fp in st.session_state.movie_file_paths if fp in all_movie_data}
 
     # --- AFTER THE LOOP ---
     if javlibrary_globally_failed_this_run:
@@ -1498,6 +1849,7 @@ def process_input_dir_callback():
 
     if st.session_state.all_movie_data and not javlibrary_globally_failed_this_run:
         st.session_state.current_movie_key = next(iter(st.session_state.all_movie_data))
+        _preload_movie_images(*itertools.islice(st.session_state.all_movie_data, 2)) # First movie shown in the editor, and the next one
         st.toast(f"✅ Processed {processed_files} movies!", icon="🎬")
     elif skipped_nfo_count > 0 and not st.session_state.all_movie_data and not javlibrary_globally_failed_this_run:
          st.toast(f"ℹ️ No new movies processed. {skipped_nfo_count} skipped due to existing NFOs.", icon="🤷")
@@ -1507,22 +1859,23 @@ def process_input_dir_callback():
 
 
 def organize_all_callback():
+    import requests, shutil, tempfile # Deferred: only needed when organizing
     # --- Get the current output directory value from session state ---
     output_dir_from_state = st.session_state.output_dir.strip()
     # --- Read the crawl mode used for the current data ---
     is_recursive_run = st.session_state.get('last_crawl_was_recursive', False)
-    print(f"[DEBUG ORGANIZE] Organizer running. Recursive mode detected: {is_recursive_run}")
+    _log.debug("[DEBUG ORGANIZE] Organizer running. Recursive mode detected: %s", is_recursive_run)
+    latest_settings = load_settings() # Read once; used for the default output dir and the crawl input dir check
 
     # --- Determine the effective *global* output directory (only used if not recursive) ---
     global_output_dir = output_dir_from_state
     if not is_recursive_run: # Only validate/create global output dir if NOT recursive
         if not output_dir_from_state:
-            print("[DEBUG ORGANIZE] Output directory field empty (non-recursive). Loading default...")
-            latest_defaults = load_settings()
-            default_output_path = latest_defaults.get("output_dir", "").strip()
+            _log.debug("[DEBUG ORGANIZE] Output directory field empty (non-recursive). Using default from settings...")
+            default_output_path = latest_settings.get("output_dir", "").strip()
             if default_output_path:
                 global_output_dir = default_output_path
-                print(f"[DEBUG ORGANIZE] Using default global output directory: {global_output_dir}")
+                _log.debug("[DEBUG ORGANIZE] Using default global output directory: %s", global_output_dir)
             else:
                 st.error("Output Directory field empty and no default set (required for non-recursive organization).")
                 return
@@ -1540,12 +1893,22 @@ def organize_all_callback():
     processed_count = 0; error_count = 0; skipped_move_count = 0 
     total_movies = len(st.session_state.all_movie_data); progress_bar = st.progress(0); status_text = st.empty()
 
-    # --- Define path to crop.py (once) ---
+    # --- Per-run existence cache (entries are updated whenever this run creates, removes or moves a file) ---
+    path_exists_cache = {}
+    def path_exists(path):
+        exists = path_exists_cache.get(path)
+        if exists is None:
+            exists = path_exists_cache[path] = os.path.exists(path)
+        return exists
+
+    # --- Load crop.py (once); folder images are cropped in-process ---
     script_dir = os.path.dirname(__file__)
-    crop_script_path = os.path.join(script_dir, "crop.py")
-    crop_script_exists = os.path.exists(crop_script_path)
-    if not crop_script_exists:
-        st.warning(f"Crop script 'crop.py' not found in the application directory ({script_dir}). Folder images cannot be generated.")
+    crop_image = None
+    try:
+        crop_image = importlib.import_module("crop").crop_image
+    except ImportError as e: # crop.py missing, or Pillow not installed
+        st.warning(f"Crop module 'crop.py' could not be loaded from the application directory ({script_dir}): {e}. Folder images cannot be generated.")
+    crop_script_exists = crop_image is not None
 
     # --- Load Naming Patterns Once ---
     poster_filename_pattern = st.session_state.get("naming_poster_filename_pattern", app_settings.DEFAULT_NAMING_POSTER_FILENAME_PATTERN)
@@ -1553,227 +1916,280 @@ def organize_all_callback():
     screenshot_filename_pattern = st.session_state.get("naming_screenshot_filename_pattern", app_settings.DEFAULT_NAMING_SCREENSHOT_FILENAME_PATTERN)
 
 
-    with st.spinner(f"Organizing {total_movies} movies..."):
-        for i, (original_filepath, data) in enumerate(st.session_state.all_movie_data.items()):
-            original_basename = os.path.basename(original_filepath)
-            status_text.text(f"Organizing: {original_basename} ({i+1}/{total_movies})")
-            download_all_flag = data.get('download_all', False)
+    # --- Per-movie work runs on a thread pool; st calls are collected as messages and made on the script thread ---
+    crawl_input_dir = latest_settings.get("input_dir", "") or st.session_state.get("input_dir", "")
+    abs_crawl_input_dir = os.path.abspath(crawl_input_dir) if crawl_input_dir else None
+    # abspath() calls getcwd(); resolve the output dir once and build per-movie absolute paths from it
+    abs_global_output_dir = os.path.abspath(global_output_dir) if not is_recursive_run else None
+    # st.cache_resource lookups need the script thread's context, so the workers get these resolved here
+    image_session = _get_image_http_session()
+    image_download_executor = _get_image_download_executor()
+    def target_dirs_for(original_filepath, data):
+        """Returns (target_dir, abs_target_dir, folder name or None in recursive mode) for one movie."""
+        if is_recursive_run:
+            return os.path.dirname(original_filepath), os.path.dirname(os.path.abspath(original_filepath)), None
+        folder_name_from_data = data.get('folder_name') # This is already pattern-generated and sanitized/truncated
+        if not folder_name_from_data: # Fallback if folder_name somehow missing
+             fb_id = data.get('id', 'NO_ID'); fb_studio = data.get('maker', ''); fb_title = data.get('title_raw', 'NO_TITLE_FB')
+             folder_name_from_data = sanitize_filename(f"{fb_id} {fb_studio} {fb_title}")
+        target_dir = os.path.join(global_output_dir, folder_name_from_data) # folder_name_from_data is already sanitized
+        abs_target_dir = os.path.normpath(os.path.join(abs_global_output_dir, folder_name_from_data)) # == os.path.abspath(target_dir)
+        return target_dir, abs_target_dir, folder_name_from_data
+
+    def organize_one(original_filepath, data):
+        """Organizes one movie; returns (processed, errors, skipped moves, messages), messages being (st function, text, icon)."""
+        processed = errors = skipped_moves = 0
+        messages = []
+        original_basename = os.path.basename(original_filepath)
+        download_all_flag = data.get('download_all', False)
 
-            try:
-                movie_id_for_logs = data.get('id', 'UNKNOWN_ID') # Standard ID for logging
-
-                # Prepare placeholder data for filename formatting
-                # Use the 'semantic' title (post-translation, pre-NFO pattern) for filenames
-                # Reconstruct semantic title if needed (similar to process_input_dir_callback)
-                base_title_for_filenames = data.get('title') # This is already NFO-patterned. We need pre-pattern.
-                                                            # title_raw is also an option, or originaltitle
-                                                            # Let's assume title_raw is the best "semantic" title before NFO formatting
-                
-                # To get the 'semantic' title for filenames, we might need to re-derive it
-                # or ensure it's stored separately. For now, use title_raw as a proxy for semantic title.
-                # A more robust way would be to store the semantic title explicitly during crawl.
-                # Using title_raw which should be the pre-NFO-formatted title.
-                
-                # Re-derive semantic_title from title_raw or originaltitle for filename patterns
-                # This semantic_title should be the movie's actual title, not prefixed by ID or patterns.
-                # Let's use originaltitle as a safe bet for a clean title, or title_raw if originaltitle is empty.
-                title_raw_from_data = data.get('title_raw', '')
-                original_title_from_data = data.get('originaltitle', '')
-                
-                semantic_title_for_filenames = title_raw_from_data if title_raw_from_data else original_title_from_data
-                if not semantic_title_for_filenames: # Fallback if both are empty
-                    # Try to strip from current data['title'] if it's patterned like "[ID] Actual Title"
-                    current_nfo_title = data.get('title', '')
-                    id_from_data = data.get('id', '')
-                    if id_from_data and current_nfo_title.startswith(f"[{id_from_data}]"):
-                        semantic_title_for_filenames = current_nfo_title[len(id_from_data)+2:].strip()
-                    elif id_from_data and re.match(re.escape(id_from_data) + r'\s*-\s*(.*)', current_nfo_title, re.IGNORECASE):
-                        match_title_strip = re.match(re.escape(id_from_data) + r'\s*-\s*(.*)', current_nfo_title, re.IGNORECASE)
-                        if match_title_strip: semantic_title_for_filenames = match_title_strip.group(1).strip()
-                    else:
-                        semantic_title_for_filenames = "NO_TITLE_FOR_FILENAME"
+        try:
+            movie_id_for_logs = data.get('id', 'UNKNOWN_ID') # Standard ID for logging
+
+            # Prepare placeholder data for filename formatting
+            # Use the 'semantic' title (post-translation, pre-NFO pattern) for filenames
+            # Reconstruct semantic title if needed (similar to process_input_dir_callback)
+            base_title_for_filenames = data.get('title') # This is already NFO-patterned. We need pre-pattern.
+                                                        # title_raw is also an option, or originaltitle
+                                                        # Let's assume title_raw is the best "semantic" title before NFO formatting
+            
+            # To get the 'semantic' title for filenames, we might need to re-derive it
+            # or ensure it's stored separately. For now, use title_raw as a proxy for semantic title.
+            # A more robust way would be to store the semantic title explicitly during crawl.
+            # Using title_raw which should be the pre-NFO-formatted title.
+            
+            # Re-derive semantic_title from title_raw or originaltitle for filename patterns
+            # This semantic_title should be the movie's actual title, not prefixed by ID or patterns.
+            # Let's use originaltitle as a safe bet for a clean title, or title_raw if originaltitle is empty.
+            title_raw_from_data = data.get('title_raw', '')
+            original_title_from_data = data.get('originaltitle', '')
+            
+            semantic_title_for_filenames = title_raw_from_data if title_raw_from_data else original_title_from_data
+            if not semantic_title_for_filenames: # Fallback if both are empty
+                # Try to strip from current data['title'] if it's patterned like "[ID] Actual Title"
+                current_nfo_title = data.get('title', '')
+                id_from_data = data.get('id', '')
+                if id_from_data and current_nfo_title.startswith(f"[{id_from_data}]"):
+                    semantic_title_for_filenames = current_nfo_title[len(id_from_data)+2:].strip()
+                elif id_from_data and re.match(re.escape(id_from_data) + r'\s*-\s*(.*)', current_nfo_title, re.IGNORECASE):
+                    match_title_strip = re.match(re.escape(id_from_data) + r'\s*-\s*(.*)', current_nfo_title, re.IGNORECASE)
+                    if match_title_strip: semantic_title_for_filenames = match_title_strip.group(1).strip()
+                else:
+                    semantic_title_for_filenames = "NO_TITLE_FOR_FILENAME"
 
 
-                actresses_list_for_filename = data.get('actresses', [])
+            actresses_list_for_filename = data.get('actresses', [])
 
 
-                filename_placeholder_data = {
-                    'id': data.get('id', ''),
-                    'content_id': data.get('content_id', data.get('id', '')),
-                    'title': semantic_title_for_filenames,
-                    'original_title': data.get('originaltitle', ''),
-                    'year': str(data.get('release_year', '')),
-                    'studio': data.get('maker', ''),
-                    'original_filename_base': data.get('_original_filename_base', ''),
-                    'actresses': actresses_list_for_filename # Pass the list
-                }
+            filename_placeholder_data = {
+                'id': data.get('id', ''),
+                'content_id': data.get('content_id', data.get('id', '')),
+                'title': semantic_title_for_filenames,
+                'original_title': data.get('originaltitle', ''),
+                'year': str(data.get('release_year', '')),
+                'studio': data.get('maker', ''),
+                'original_filename_base': data.get('_original_filename_base', ''),
+                'actresses': actresses_list_for_filename # Pass the list
+            }
 
 
-                if not os.path.exists(original_filepath):
-                    st.toast(f"Skip: Original file '{original_basename}' not found.", icon="⚠️"); error_count += 1; continue
+            if not path_exists(original_filepath):
+                messages.append(('toast', f"Skip: Original file '{original_basename}' not found.", "⚠️")); return 0, 1, 0, messages
+
+            # --- Determine Target Directory based on Mode ---
+            abs_original_filepath = os.path.abspath(original_filepath)
+            target_dir, abs_target_dir, folder_name_from_data = target_dirs_for(original_filepath, data)
+            if not is_recursive_run and abs_crawl_input_dir and abs_target_dir == abs_crawl_input_dir:
+                 messages.append(('toast', f"Skip: Output folder '{folder_name_from_data}' is same as crawl Input Dir for '{original_basename}'.", "❗"))
+                 errors += 1
+                 return processed, errors, skipped_moves, messages
+            os.makedirs(target_dir, exist_ok=True)
+            target_dir_prefix = os.path.join(target_dir, '') # With one trailing separator; prefix + name == os.path.join(target_dir, name)
+            # One listing per target folder replaces the per-image probes for already downloaded files
+            with os.scandir(target_dir) as it:
+                existing_target_names = {os.path.normcase(entry.name) for entry in it}
+
+            # --- NFO Generation ---
+            nfo_base_name_to_use = data.get('_original_filename_base', movie_id_for_logs)
+            sanitized_nfo_filename_base = sanitize_filename(nfo_base_name_to_use)
+            nfo_filename = f"{sanitized_nfo_filename_base}.nfo"
+            nfo_path = target_dir_prefix + nfo_filename
+            generate_nfo(data, filename=nfo_path, download_all_flag=download_all_flag, messages=messages)
+            submitted_download_names = set()
+            def submit_image_download(url, base_filename_pattern, current_target_dir, placeholder_data_for_img, source_page_url="", log_movie_id="UNKNOWN", screenshot_idx_for_pattern=None):
+                if not url: return None
+                
+                # Format the base filename using the pattern and data
+                formatted_base_filename = format_string_with_placeholders(base_filename_pattern, placeholder_data_for_img, screenshot_index=screenshot_idx_for_pattern)
+                safe_base_filename = sanitize_filename(formatted_base_filename)
+                if not safe_base_filename: safe_base_filename = sanitize_filename(log_movie_id + ("_img" if screenshot_idx_for_pattern is None else f"_ss{screenshot_idx_for_pattern}"))
+
+                # Poster and screenshots resolving to the same name (e.g. a pattern without {n}) keep the first download, as sequential runs did
+                download_key = os.path.normcase(safe_base_filename)
+                if download_key in submitted_download_names: return None
+                submitted_download_names.add(download_key)
+                abs_url = urljoin(source_page_url, url)
+                future = image_download_executor.submit(_download_image_file, image_session, abs_url, current_target_dir, safe_base_filename, source_page_url, existing_target_names)
+                return future, safe_base_filename, log_movie_id
+
+            def wait_image_download(pending_download):
+                # Errors become messages; organize_one runs on a pool thread, where st calls don't work
+                if not pending_download: return None
+                future, safe_base_filename, log_movie_id = pending_download
+                try:
+                    downloaded_path = future.result()
+                    path_exists_cache[downloaded_path] = True
+                    return downloaded_path
+                except requests.exceptions.Timeout: messages.append(('toast', f"DL Timeout: '{safe_base_filename}' for {log_movie_id}.", "⏱️"))
+                except requests.exceptions.RequestException as e: messages.append(('toast', f"DL Fail: '{safe_base_filename}' for {log_movie_id} ({e}).", "❌"))
+                except Exception as e: messages.append(('toast', f"DL Error: '{safe_base_filename}' for {log_movie_id} ({e}).", "💥"))
+                return None
 
-                # --- Determine Target Directory based on Mode ---
-                if is_recursive_run:
-                    target_dir = os.path.dirname(original_filepath)
-                else:
-                    folder_name_from_data = data.get('folder_name') # This is already pattern-generated and sanitized/truncated
-                    if not folder_name_from_data: # Fallback if folder_name somehow missing
-                         fb_id = data.get('id', 'NO_ID'); fb_studio = data.get('maker', ''); fb_title = data.get('title_raw', 'NO_TITLE_FB')
-                         folder_name_from_data = sanitize_filename(f"{fb_id} {fb_studio} {fb_title}")
-
-                    target_dir = os.path.join(global_output_dir, folder_name_from_data) # folder_name_from_data is already sanitized
-
-                    crawl_input_dir = load_settings().get("input_dir", "")
-                    if not crawl_input_dir: crawl_input_dir = st.session_state.get("input_dir", "")
-                    abs_target_dir = os.path.abspath(target_dir)
-                    abs_crawl_input_dir = os.path.abspath(crawl_input_dir) if crawl_input_dir else None
-                    if abs_crawl_input_dir and abs_target_dir == abs_crawl_input_dir:
-                         st.toast(f"Skip: Output folder '{folder_name_from_data}' is same as crawl Input Dir for '{original_basename}'.", icon="❗")
-                         error_count += 1
-                         continue
-                os.makedirs(target_dir, exist_ok=True)
-
-                # --- NFO Generation ---
-                nfo_base_name_to_use = data.get('_original_filename_base', movie_id_for_logs)
-                sanitized_nfo_filename_base = sanitize_filename(nfo_base_name_to_use)
-                nfo_filename = f"{sanitized_nfo_filename_base}.nfo"
-                nfo_path = os.path.join(target_dir, nfo_filename)
-                generate_nfo(data, filename=nfo_path, download_all_flag=download_all_flag)
-                processed_image_count_this_movie = 0
-
-                def download_image(url, base_filename_pattern, current_target_dir, placeholder_data_for_img, source_page_url="", log_movie_id="UNKNOWN", screenshot_idx_for_pattern=None):
-                    nonlocal processed_image_count_this_movie
-                    if not url: return None
-                    
-                    # Format the base filename using the pattern and data
-                    formatted_base_filename = format_string_with_placeholders(base_filename_pattern, placeholder_data_for_img, screenshot_index=screenshot_idx_for_pattern)
-                    safe_base_filename = sanitize_filename(formatted_base_filename)
-                    if not safe_base_filename: safe_base_filename = sanitize_filename(log_movie_id + ("_img" if screenshot_idx_for_pattern is None else f"_ss{screenshot_idx_for_pattern}"))
-
-
-                    abs_url = urljoin(source_page_url, url); potential_extensions = ['.jpg', '.jpeg', '.png', '.webp', '.gif'];
-                    existing_file = None
-                    for ext in potential_extensions:
-                        potential_path = os.path.join(current_target_dir, f"{safe_base_filename}{ext}")
-                        if os.path.exists(potential_path): existing_file = potential_path; break
-                    if existing_file: return existing_file
-                    try:
-                        headers = {'User-Agent': 'Mozilla/5.0...', 'Referer': source_page_url or 'https://google.com/'}
-                        r = requests.get(abs_url, stream=True, timeout=30, headers=headers); r.raise_for_status(); content_type = r.headers.get('content-type'); final_ext = '.jpg'
-                        if content_type: mime_type = content_type.split(';')[0].lower(); mime_ext_map = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/gif': '.gif', 'image/webp': '.webp'}; final_ext = mime_ext_map.get(mime_type, '.jpg')
-                        final_filename = f"{safe_base_filename}{final_ext}"
-                        final_target_img_path = os.path.join(current_target_dir, final_filename)
-                        if not os.path.exists(final_target_img_path):
-                            with open(final_target_img_path, 'wb') as f:
-                                for chunk in r.iter_content(1024*8): f.write(chunk)
-                            processed_image_count_this_movie += 1;
-                            print(f"[DEBUG DL] Successfully downloaded: {final_filename} to {current_target_dir}")
-                            return final_target_img_path
-                        else:
-                            print(f"[DEBUG DL] Image '{final_filename}' already exists in {current_target_dir} (checked again).")
-                            return final_target_img_path
-                    except requests.exceptions.Timeout: st.toast(f"DL Timeout: '{safe_base_filename}' for {log_movie_id}.", icon="⏱️")
-                    except requests.exceptions.RequestException as e: st.toast(f"DL Fail: '{safe_base_filename}' for {log_movie_id} ({e}).", icon="❌")
-                    except Exception as e: st.toast(f"DL Error: '{safe_base_filename}' for {log_movie_id} ({e}).", icon="💥")
-                    return None
-
-                source_url = data.get('url', ''); screenshot_urls = data.get('screenshot_urls', [])
-
-                # --- Poster Download ---
-                poster_url_to_download = data.get('poster_manual_url') or get_auto_poster_url(data)
-                downloaded_poster_path = None
-                if poster_url_to_download:
-                    downloaded_poster_path = download_image(
-                        poster_url_to_download, 
-                        poster_filename_pattern, # Use pattern
+            source_url = data.get('url', ''); screenshot_urls = data.get('screenshot_urls', [])
+
+            # --- Poster Download (screenshots are queued right behind it and download while the folder image is made) ---
+            poster_url_to_download = data.get('poster_manual_url') or get_auto_poster_url(data)
+            downloaded_poster_path = None
+            pending_poster_download = None
+            if poster_url_to_download:
+                pending_poster_download = submit_image_download(
+                    poster_url_to_download, 
+                    poster_filename_pattern, # Use pattern
+                    target_dir, 
+                    filename_placeholder_data, # Pass placeholder data
+                    source_url, 
+                    log_movie_id=movie_id_for_logs
+                )
+            else:
+                _log.debug("[DEBUG ORGANIZE] No poster URL for %s.", movie_id_for_logs)
+
+            pending_screenshot_downloads = []
+            if download_all_flag:
+                actual_poster_url_downloaded = poster_url_to_download
+                # dict.fromkeys drops repeated gallery URLs (keeping order), so each image is fetched once per movie
+                screenshots_to_process = [ss_url for ss_url in dict.fromkeys(screenshot_urls) if ss_url and ss_url != actual_poster_url_downloaded]
+                if screenshots_to_process: _log.debug("[DEBUG ORGANIZE] Downloading %s screenshots to %s...", len(screenshots_to_process), target_dir)
+                for ss_idx, url_img in enumerate(screenshots_to_process):
+                    pending_screenshot_downloads.append(submit_image_download(
+                        url_img, 
+                        screenshot_filename_pattern, # Use pattern
                         target_dir, 
                         filename_placeholder_data, # Pass placeholder data
                         source_url, 
-                        log_movie_id=movie_id_for_logs
-                    )
+                        log_movie_id=movie_id_for_logs,
+                        screenshot_idx_for_pattern=ss_idx + 1 # Pass index for {n}
+                    ))
+
+            downloaded_poster_path = wait_image_download(pending_poster_download)
+
+            # --- Folder Image Generation ---
+            if downloaded_poster_path and path_exists(downloaded_poster_path) and crop_script_exists:
+                poster_ext = os.path.splitext(downloaded_poster_path)[1]
+                # Format folder image filename using pattern
+                folder_img_base_name_formatted = format_string_with_placeholders(folder_image_filename_pattern, filename_placeholder_data)
+                folder_img_base_name_safe = sanitize_filename(folder_img_base_name_formatted)
+                if not folder_img_base_name_safe: folder_img_base_name_safe = sanitize_filename(movie_id_for_logs + "_folder_fallback")
+
+                folder_img_path = f"{target_dir_prefix}{folder_img_base_name_safe}{poster_ext}" # Use poster's extension
+                
+                if not path_exists(folder_img_path):
+                    # Crop into a temporary file next to the target and move it into place, so a failed or
+                    # concurrent crop never leaves a partial folder image (the suffix keeps Pillow's format choice)
+                    temp_fd, temp_folder_img_path = tempfile.mkstemp(suffix=poster_ext, prefix=f".{folder_img_base_name_safe}.", dir=target_dir)
+                    os.close(temp_fd)
+                    try:
+                        _log.debug("--- DEBUG: Cropping '%s' into '%s'", downloaded_poster_path, folder_img_path)
+                        crop_image(downloaded_poster_path, temp_folder_img_path)
+                        os.replace(temp_folder_img_path, folder_img_path)
+                        path_exists_cache[folder_img_path] = True
+                        _log.debug("--- DEBUG: Successfully created folder image: %s", folder_img_path)
+                    except Exception as crop_e:
+                        messages.append(('error', f"Error cropping '{os.path.basename(downloaded_poster_path)}': {crop_e}. Check console.", None))
+                        _log.exception("Crop failed for %s", downloaded_poster_path)
+                        try: os.remove(temp_folder_img_path)
+                        except OSError: pass
                 else:
-                    print(f"[DEBUG ORGANIZE] No poster URL for {movie_id_for_logs}.")
+                     _log.debug("[DEBUG CROP] Folder image '%s' already exists in %s. Skipping crop.", os.path.basename(folder_img_path), target_dir)
+            elif not downloaded_poster_path or not path_exists(downloaded_poster_path): _log.debug("[DEBUG CROP] Skipping folder img gen for '%s', poster issue.", original_basename)
+            elif not crop_script_exists: _log.debug("[DEBUG CROP] Skipping folder img gen for '%s', crop.py missing.", original_basename)
 
-                # --- Folder Image Generation ---
-                if downloaded_poster_path and os.path.exists(downloaded_poster_path) and crop_script_exists:
-                    poster_ext = os.path.splitext(downloaded_poster_path)[1]
-                    # Format folder image filename using pattern
-                    folder_img_base_name_formatted = format_string_with_placeholders(folder_image_filename_pattern, filename_placeholder_data)
-                    folder_img_base_name_safe = sanitize_filename(folder_img_base_name_formatted)
-                    if not folder_img_base_name_safe: folder_img_base_name_safe = sanitize_filename(movie_id_for_logs + "_folder_fallback")
+            # --- Screenshot Download (wait for the ones queued with the poster) ---
+            for pending_screenshot_download in pending_screenshot_downloads:
+                wait_image_download(pending_screenshot_download)
 
-                    folder_img_path = os.path.join(target_dir, f"{folder_img_base_name_safe}{poster_ext}") # Use poster's extension
-                    
-                    if not os.path.exists(folder_img_path):
+            # --- Conditional Move Movie File ---
+            if not is_recursive_run:
+                target_movie_path = target_dir_prefix + original_basename
+                abs_target_movie_path = os.path.join(abs_target_dir, original_basename)
+
+                if abs_original_filepath != abs_target_movie_path:
+                    if not path_exists(target_movie_path):
                         try:
-                            cmd = [sys.executable, crop_script_path, downloaded_poster_path, folder_img_path]
-                            print(f"--- DEBUG: Running crop command: {' '.join(cmd)}")
-                            result = subprocess.run(cmd, capture_output=True, text=True, check=False, encoding='utf-8', timeout=15)
-                            if result.returncode == 0 and os.path.exists(folder_img_path):
-                                print(f"--- DEBUG: Successfully created folder image: {folder_img_path}")
-                            elif result.returncode == 0 and not os.path.exists(folder_img_path):
-                                st.warning(f"Crop script OK but output '{os.path.basename(folder_img_path)}' not found for '{original_basename}'.", icon="⚠️")
-                                print(f"--- DEBUG: Crop script stdout/stderr:\n{result.stdout}\n{result.stderr}")
-                            else:
-                                st.error(f"Error crop.py (code {result.returncode}) for '{os.path.basename(downloaded_poster_path)}'. Check console.")
-                                print(f"--- ERROR: Crop script failed for {downloaded_poster_path} ---\nReturn Code: {result.returncode}\nStdout:\n{result.stdout}\nStderr:\n{result.stderr}")
-                                if os.path.exists(folder_img_path):
-                                    try: os.remove(folder_img_path)
-                                    except OSError: pass
-                        except FileNotFoundError: st.error(f"Error: Python executable '{sys.executable}' or crop script '{crop_script_path}' not found.")
-                        except subprocess.TimeoutExpired: st.error(f"Error: Cropping '{os.path.basename(downloaded_poster_path)}' timed out.")
-                        except Exception as crop_e: st.error(f"Unexpected error cropping '{os.path.basename(downloaded_poster_path)}': {crop_e}")
-                    else:
-                         print(f"[DEBUG CROP] Folder image '{os.path.basename(folder_img_path)}' already exists in {target_dir}. Skipping crop.")
-                elif not downloaded_poster_path or not os.path.exists(downloaded_poster_path): print(f"[DEBUG CROP] Skipping folder img gen for '{original_basename}', poster issue.")
-                elif not crop_script_exists: print(f"[DEBUG CROP] Skipping folder img gen for '{original_basename}', crop.py missing.")
-
-                # --- Screenshot Download ---
-                if download_all_flag:
-                    actual_poster_url_downloaded = poster_url_to_download
-                    screenshots_to_process = [ss_url for ss_url in screenshot_urls if ss_url and ss_url != actual_poster_url_downloaded]
-                    if screenshots_to_process: print(f"[DEBUG ORGANIZE] Downloading {len(screenshots_to_process)} screenshots to {target_dir}...")
-                    for ss_idx, url_img in enumerate(screenshots_to_process):
-                        download_image(
-                            url_img, 
-                            screenshot_filename_pattern, # Use pattern
-                            target_dir, 
-                            filename_placeholder_data, # Pass placeholder data
-                            source_url, 
-                            log_movie_id=movie_id_for_logs,
-                            screenshot_idx_for_pattern=ss_idx + 1 # Pass index for {n}
-                        )
-
-                # --- Conditional Move Movie File ---
-                if not is_recursive_run:
-                    target_movie_path = os.path.join(target_dir, original_basename)
-                    abs_target_movie_path = os.path.abspath(target_movie_path)
-                    abs_original_filepath = os.path.abspath(original_filepath)
-
-                    if abs_original_filepath != abs_target_movie_path:
-                        if not os.path.exists(target_movie_path):
+                            _log.debug("[DEBUG ORGANIZE NON-RECURSIVE] Moving '%s' to '%s'", abs_original_filepath, abs_target_movie_path)
                             try:
-                                print(f"[DEBUG ORGANIZE NON-RECURSIVE] Moving '{abs_original_filepath}' to '{abs_target_movie_path}'")
-                                shutil.move(original_filepath, target_movie_path)
-                            except Exception as move_error:
-                                st.error(f"Failed to move '{original_basename}': {move_error}")
-                                error_count += 1
-                                continue 
-                        else:
-                            st.toast(f"Skip move: '{original_basename}' already exists in target '{target_dir}'.", icon="ℹ️")
-                            skipped_move_count += 1 
+                                os.replace(original_filepath, target_movie_path) # Same filesystem: a plain rename
+                            except OSError as rename_error:
+                                if rename_error.errno != errno.EXDEV: raise
+                                shutil.move(original_filepath, target_movie_path) # Different drive/filesystem: copy + delete
+                            path_exists_cache[target_movie_path] = True
+                            path_exists_cache[original_filepath] = False
+                        except Exception as move_error:
+                            messages.append(('error', f"Failed to move '{original_basename}': {move_error}", None))
+                            errors += 1
+                            return processed, errors, skipped_moves, messages
                     else:
-                        st.toast(f"Skip move: Source/Target path identical for '{original_basename}'.", icon="ℹ️")
-                        skipped_move_count += 1
+                        messages.append(('toast', f"Skip move: '{original_basename}' already exists in target '{target_dir}'.", "ℹ️"))
+                        skipped_moves += 1
                 else:
-                    print(f"[DEBUG ORGANIZE RECURSIVE] Skipping move for '{original_basename}'. File remains in '{os.path.dirname(original_filepath)}'.")
+                    messages.append(('toast', f"Skip move: Source/Target path identical for '{original_basename}'.", "ℹ️"))
+                    skipped_moves += 1
+            else:
+                _log.debug("[DEBUG ORGANIZE RECURSIVE] Skipping move for '%s'. File remains in '%s'.", original_basename, os.path.dirname(original_filepath))
 
-                processed_count += 1
-            except Exception as e:
-                st.error(f"Unexpected error organizing '{original_basename}': {e}")
-                logging.exception(f"Organizer loop error for {original_basename}") # Log traceback
-                error_count += 1
-            progress_bar.progress((i + 1) / total_movies)
+            processed += 1
+        except Exception as e:
+            messages.append(('error', f"Unexpected error organizing '{original_basename}': {e}", None))
+            _log.exception("Organizer loop error for %s", original_basename) # Log traceback
+            errors += 1
+
+        return processed, errors, skipped_moves, messages
+
+    def organize_folder(folder_movies):
+        """Organizes the movies sharing one target folder in crawl order; returns [(basename, organize_one result)]."""
+        # Image names such as "folder"/"fanart" usually carry no ID, so movies in one folder must not run concurrently,
+        # and the first movie's images are the ones kept, as in a sequential run
+        folder_results = []
+        for original_filepath, data in folder_movies:
+            original_basename = os.path.basename(original_filepath)
+            try:
+                folder_results.append((original_basename, organize_one(original_filepath, data)))
+            except Exception as e: # organize_one reports its own errors; this only guards the rest of the folder
+                _log.exception("Organizer task failed for %s", original_basename)
+                folder_results.append((original_basename, (0, 1, 0, [('error', f"Unexpected error organizing '{original_basename}': {e}", None)])))
+        return folder_results
+
+    # Group by normcased absolute target folder on the script thread; each folder is one pool task
+    movies_by_target_folder = {}
+    for original_filepath, data in st.session_state.all_movie_data.items():
+        folder_key = os.path.normcase(target_dirs_for(original_filepath, data)[1])
+        movies_by_target_folder.setdefault(folder_key, []).append((original_filepath, data))
+
+    with st.spinner(f"Organizing {total_movies} movies..."):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="organize") as organize_executor:
+            organize_futures = [organize_executor.submit(organize_folder, folder_movies) for folder_movies in movies_by_target_folder.values()]
+            last_ui_update = 0.0; done_count = 0
+            for organize_future in concurrent.futures.as_completed(organize_futures):
+                for original_basename, (movie_processed, movie_errors, movie_skipped_moves, movie_messages) in organize_future.result():
+                    done_count += 1
+                    processed_count += movie_processed; error_count += movie_errors; skipped_move_count += movie_skipped_moves
+                    for message_kind, message_text, message_icon in movie_messages:
+                        getattr(st, message_kind)(message_text, icon=message_icon)
+                    # Status/progress are pushed at most 10 times per second (and always for the last movie)
+                    now = time.monotonic()
+                    if now - last_ui_update >= 0.1 or done_count == total_movies:
+                        last_ui_update = now
+                        status_text.text(f"Organized: {original_basename} ({done_count}/{total_movies})")
+                        progress_bar.progress(done_count / total_movies)
 
     # --- End Main Loop ---
     status_text.text(f"Organization complete. Processed: {processed_count}. Errors: {error_count}. Skipped Moves (Non-Recursive): {skipped_move_count}.")
@@ -1889,7 +2305,7 @@ def rescrape_with_url_callback():
 
     scraper_url_map = {}
     for scraper_name in selected_scrapers_for_rescrape:
-        if scraper_name not in SCRAPER_REGISTRY:
+        if scraper_name not in _AVAILABLE_SCRAPER_SET:
             st.error(f"Selected scraper '{scraper_name}' is not available.")
             return
         url_key = f"rescrape_url_{scraper_name}"
@@ -1918,8 +2334,8 @@ def rescrape_with_url_callback():
 
     for scraper_name, url_to_scrape in scraper_url_map.items():
         status_placeholder.info(f"Re-crawling with {scraper_name}")
-        scrape_func = SCRAPER_REGISTRY[scraper_name]['scrape']
         try:
+            scrape_func = _load_scraper(scraper_name)['scrape']
             raw_data = None
             if scraper_name == "Javlibrary":
                 raw_data = scrape_func(url_to_scrape, user_agent=current_jl_user_agent, cf_clearance_token=current_jl_cf_token)
@@ -1943,7 +2359,7 @@ def rescrape_with_url_callback():
                 st.warning(f"Scraper '{scraper_name}' did not return any data from the URL: {url_to_scrape}")
         except Exception as e:
             st.error(f"Error during re-scrape with '{scraper_name}': {e}")
-            logging.exception(f"Error re-scraping {current_movie_key} with {scraper_name} from {url_to_scrape}")
+            _log.exception("Error re-scraping %s with %s from %s", current_movie_key, scraper_name, url_to_scrape)
 
     if javlibrary_failed_this_rescrape_attempt:
         status_placeholder.empty()
@@ -1974,6 +2390,7 @@ def rescrape_with_url_callback():
     processed_data_for_movie['download_all'] = original_movie_entry.get('download_all', default_dl_all_initial)
     processed_data_for_movie.update(merged_data)
     processed_data_for_movie['_field_sources'] = field_sources
+    processed_data_for_movie['_contributing_scrapers'] = tuple(sorted(set(field_sources.values())))
 
     if 'id' not in processed_data_for_movie or not processed_data_for_movie.get('id'):
         processed_data_for_movie['id'] = original_movie_entry.get('id', sanitize_id_for_scraper(original_movie_entry.get('_original_filename_base','')))
@@ -1990,28 +2407,29 @@ def rescrape_with_url_callback():
     translation_possible_for_rescrape = True
     if translation_enabled:
         if not target_language: translation_possible_for_rescrape = False
-        if translator_service in ["DeepL", "DeepSeek"] and not api_key_trans: translation_possible_for_rescrape = False
+        if translator_service in API_KEY_TRANSLATORS and not api_key_trans: translation_possible_for_rescrape = False
 
     if translation_enabled and translation_possible_for_rescrape:
         status_placeholder.info("Translating re-scraped data...")
         title_to_translate = processed_data_for_movie.get('title', '')
         desc_to_translate = processed_data_for_movie.get('description', '')
 
-        if translate_title_flag and title_to_translate:
-            translated_title = _run_translation_script(translator_service, title_to_translate, target_language, api_key_trans)
-            if translated_title:
-                processed_data_for_movie['title'] = translated_title
-
-        if translate_desc_flag and desc_to_translate:
-            translated_desc = _run_translation_script(translator_service, desc_to_translate, target_language, api_key_trans)
-            if translated_desc:
-                if keep_orig_desc_flag and desc_to_translate:
-                    processed_data_for_movie['description'] = f"{translated_desc}\n\n{desc_to_translate}"
+        # Title and description go to the translator in one call; empty/whitespace-only texts are left out
+        translation_batch = [
+            (field, text) for field, text, enabled in (('title', title_to_translate, translate_title_flag), ('description', desc_to_translate, translate_desc_flag))
+            if enabled and isinstance(text, str) and text.strip()
+        ]
+        if translation_batch:
+            translated_texts = _run_translation_batch(translator_service, [text for _, text in translation_batch], target_language, api_key_trans)
+            for (field, _), translated_text in zip(translation_batch, translated_texts):
+                if not translated_text: continue
+                if field == 'description' and keep_orig_desc_flag:
+                    processed_data_for_movie['description'] = f"{translated_text}\n\n{desc_to_translate}"
                 else:
-                    processed_data_for_movie['description'] = translated_desc
+                    processed_data_for_movie[field] = translated_text
 
     status_placeholder.info("Applying genre blacklist...")
-    current_genre_blacklist_lc = current_settings_for_merge.get("genre_blacklist", [])
+    current_genre_blacklist_lc = frozenset(current_settings_for_merge.get("genre_blacklist", []))
     if current_genre_blacklist_lc and \
        'genres' in processed_data_for_movie and \
        isinstance(processed_data_for_movie['genres'], list) and \
@@ -2021,8 +2439,8 @@ def rescrape_with_url_callback():
             genre_item
             for genre_item in original_genres_for_movie
             if isinstance(genre_item, str) and \
-               genre_item.strip() and \
-               genre_item.strip().lower() not in current_genre_blacklist_lc
+               (stripped_genre := genre_item.strip()) and \
+               stripped_genre.lower() not in current_genre_blacklist_lc
         ]
         processed_data_for_movie['genres'] = filtered_movie_genres
 
@@ -2037,9 +2455,9 @@ def rescrape_with_url_callback():
     temp_id_prefix_for_strip1 = f"[{current_id_for_patterns}]"
     temp_id_prefix_for_strip2 = f"{current_id_for_patterns} -"
 
-    if semantic_title_for_patterns.lower().startswith(temp_id_prefix_for_strip1.lower()):
+    if _startswith_ci(semantic_title_for_patterns, temp_id_prefix_for_strip1):
         semantic_title_for_patterns = semantic_title_for_patterns[len(temp_id_prefix_for_strip1):].lstrip(" -").strip()
-    elif semantic_title_for_patterns.lower().startswith(temp_id_prefix_for_strip2.lower()):
+    elif _startswith_ci(semantic_title_for_patterns, temp_id_prefix_for_strip2):
         match = re.match(re.escape(current_id_for_patterns) + r'\s*-\s*(.*)', semantic_title_for_patterns, re.IGNORECASE)
         if match:
             semantic_title_for_patterns = match.group(1).strip()
@@ -2102,37 +2520,47 @@ def rescrape_with_url_callback():
 
     st.session_state._apply_changes_triggered = False
 
-# --- Other Callbacks (update_download_all_flag, go_previous/next_movie) remain unchanged ---
-def update_download_all_flag():
+# --- Other Callbacks (apply_movie_toggles_callback, go_previous/next_movie) ---
+def apply_movie_toggles_callback():
+    # Submit handler for "movie_toggles_form": both checkboxes are committed to session state together,
+    # so one rerun covers the download_all flag and the temporary screenshot override.
     movie_key = st.session_state.current_movie_key; checkbox_key = f"cb_download_all_{movie_key}"
     if movie_key and checkbox_key in st.session_state and movie_key in st.session_state.all_movie_data:
         st.session_state.all_movie_data[movie_key]['download_all'] = st.session_state[checkbox_key]
 
-def go_previous_movie():
+def _movie_key_index():
+    """Returns (movie keys tuple, key -> position); rebuilt only when all_movie_data is replaced or changes size."""
+    all_movie_data = st.session_state.all_movie_data
+    cached = st.session_state.get("_movie_key_index")
+    if cached is None or cached[0] is not all_movie_data or len(cached[1]) != len(all_movie_data):
+        keys = tuple(fp for fp in all_movie_data if fp)
+        cached = (all_movie_data, keys, {fp: idx for idx, fp in enumerate(keys)})
+        st.session_state._movie_key_index = cached
+    return cached[1], cached[2]
+
+def _step_current_movie(step):
     if st.session_state.current_movie_key and st.session_state.all_movie_data:
-        keys = list(st.session_state.all_movie_data.keys())
-        try: current_index = keys.index(st.session_state.current_movie_key)
-        except ValueError:
+        keys, key_to_index = _movie_key_index()
+        current_index = key_to_index.get(st.session_state.current_movie_key)
+        if current_index is None:
              if keys: st.session_state.current_movie_key = keys[0]
              st.session_state.show_current_movie_screenshots_override = False 
              st.rerun(); return 
-        if current_index > 0:
-            st.session_state.current_movie_key = keys[current_index - 1]
+        if 0 <= current_index + step < len(keys):
+            st.session_state.current_movie_key = keys[current_index + step]
+            following_index = current_index + 2 * step # Warm the movie one more step in the same direction too
+            _preload_movie_images(st.session_state.current_movie_key, keys[following_index] if 0 <= following_index < len(keys) else None)
             st.session_state._apply_changes_triggered = False 
             st.session_state.show_current_movie_screenshots_override = False 
 
+def go_previous_movie():
+    _step_current_movie(-1)
+
 def go_next_movie():
-     if st.session_state.current_movie_key and st.session_state.all_movie_data:
-        keys = list(st.session_state.all_movie_data.keys())
-        try: current_index = keys.index(st.session_state.current_movie_key)
-        except ValueError:
-             if keys: st.session_state.current_movie_key = keys[0]
-             st.session_state.show_current_movie_screenshots_override = False 
-             st.rerun(); return 
-        if current_index < len(keys) - 1:
-            st.session_state.current_movie_key = keys[current_index + 1]
-            st.session_state._apply_changes_triggered = False 
-            st.session_state.show_current_movie_screenshots_override = False 
+    _step_current_movie(1)
+
+def toggle_raw_data_expanded():
+    st.session_state._raw_expanded = not st.session_state.get("_raw_expanded", False)
 # --- End Callbacks ---
 
 # --- Save Settings Callback ---
@@ -2150,17 +2578,11 @@ def save_settings_callback():
     # Update field priorities from text inputs
     new_priorities = {}
     try:
-        available_scrapers_lower = {name.lower(): name for name in AVAILABLE_SCRAPER_NAMES}
-        for field_key in app_settings.PRIORITY_FIELDS_ORDERED:
-            input_key = f"priority_{field_key}"
+        for field_key, input_key in _PRIORITY_INPUT_KEYS.items():
             if input_key in st.session_state:
-                priority_str = st.session_state[input_key].strip()
-                user_priority_list = [s.strip() for s in priority_str.split(',') if s.strip()]
-                validated_list = []
-                for name in user_priority_list:
-                    if name.lower() in available_scrapers_lower:
-                        validated_list.append(available_scrapers_lower[name.lower()])
-                new_priorities[field_key] = validated_list
+                priority_str = st.session_state[input_key]
+                new_priorities[field_key] = [_AVAILABLE_SCRAPERS_LOWER[name_lower] for name in priority_str.split(',')
+                                             if (name_lower := name.strip().lower()) in _AVAILABLE_SCRAPERS_LOWER]
             else:
                  new_priorities[field_key] = st.session_state.field_priorities.get(field_key, [])
         st.session_state.field_priorities = new_priorities
@@ -2193,14 +2615,18 @@ def save_settings_callback():
     # --- GENRE BLACKLIST ---
     if "ui_genre_blacklist_input_settings" in st.session_state:
         blacklist_input_str = st.session_state.ui_genre_blacklist_input_settings
-        if isinstance(blacklist_input_str, str) and blacklist_input_str.strip():
-            parsed_blacklist = [genre.strip().lower() for genre in blacklist_input_str.split(',') if genre.strip()]
-            st.session_state.genre_blacklist = sorted(list(set(parsed_blacklist)))
+        last_blacklist_parse = st.session_state.get("_last_blacklist_parse") # (input string, resulting list)
+        if last_blacklist_parse and last_blacklist_parse[0] == blacklist_input_str and last_blacklist_parse[1] == st.session_state.get("genre_blacklist"):
+            pass # Field untouched since the last save: the stored list is already its parse
+        elif isinstance(blacklist_input_str, str) and blacklist_input_str.strip():
+            deduped_blacklist = sorted({stripped.lower() for genre in blacklist_input_str.split(',') if (stripped := genre.strip())})
+            set_genre_blacklist_state(deduped_blacklist)
         else: 
-            st.session_state.genre_blacklist = [] 
+            set_genre_blacklist_state([])
+        st.session_state._last_blacklist_parse = (blacklist_input_str, st.session_state.genre_blacklist)
         print(f"Updated st.session_state.genre_blacklist from UI: {st.session_state.genre_blacklist}")
     elif "genre_blacklist" not in st.session_state:
-         st.session_state.genre_blacklist = []
+         set_genre_blacklist_state([])
          print("Warning: 'ui_genre_blacklist_input_settings' not in st.session_state, initialized genre_blacklist to empty.")
 
     save_settings_to_file()
@@ -2336,11 +2762,12 @@ def show_crawler_page():
 
     if st.session_state.crawler_view == "Editor":
         if st.session_state.all_movie_data:
-            valid_keys = [fp for fp in st.session_state.all_movie_data.keys() if fp]
+            valid_keys, key_to_index = _movie_key_index()
             if valid_keys:
                 # --- Movie Navigation ---
                 is_recursive_display = st.session_state.get("last_crawl_was_recursive", False)
-                movie_options = {fp: (fp if is_recursive_display else os.path.basename(fp)) for fp in valid_keys}
+                _basename = os.path.basename
+                movie_options = {fp: (fp if is_recursive_display else _basename(fp)) for fp in valid_keys}
                 if st.session_state.current_movie_key not in movie_options:
                     st.session_state.current_movie_key = valid_keys[0] if valid_keys else None
                     if st.session_state.current_movie_key:
@@ -2350,8 +2777,8 @@ def show_crawler_page():
 
                 current_index = 0
                 if st.session_state.current_movie_key:
-                    try: current_index = valid_keys.index(st.session_state.current_movie_key)
-                    except ValueError: 
+                    current_index = key_to_index.get(st.session_state.current_movie_key)
+                    if current_index is None:
                         st.session_state.current_movie_key = valid_keys[0] if valid_keys else None
                         current_index = 0
                         if st.session_state.current_movie_key:
@@ -2366,6 +2793,9 @@ def show_crawler_page():
 
                 def update_current_movie_selection():
                     st.session_state.current_movie_key = st.session_state.movie_selector
+                    keys, key_to_index = _movie_key_index()
+                    following_index = key_to_index.get(st.session_state.current_movie_key, len(keys)) + 1
+                    _preload_movie_images(st.session_state.current_movie_key, keys[following_index] if following_index < len(keys) else None)
                     st.session_state._apply_changes_triggered = False
                     st.session_state.show_current_movie_screenshots_override = False # Reset on movie change
 
@@ -2380,10 +2810,8 @@ def show_crawler_page():
                 
                 if st.session_state.current_movie_key: # Display sources
                     data_sources = st.session_state.all_movie_data.get(st.session_state.current_movie_key, {})
-                    field_sources_val = data_sources.get('_field_sources', {})
-                    if field_sources_val:
-                        contrib_scrapers = sorted(list(set(field_sources_val.values())))
-                        if contrib_scrapers: st.caption(f"**Sources:** {', '.join([f'**`{s}`**' for s in contrib_scrapers])}")
+                    contrib_scrapers = data_sources.get('_contributing_scrapers') # Sorted tuple cached when sources are merged
+                    if contrib_scrapers: st.caption(f"**Sources:** {', '.join([f'**`{s}`**' for s in contrib_scrapers])}")
                     elif data_sources.get('source') == 'manual': st.caption("**Source:** Manual Entry")
             else: # No valid keys
                 st.warning("Movie data dictionary is empty or invalid.")
@@ -2403,30 +2831,19 @@ def show_crawler_page():
                 st.session_state._apply_changes_triggered = False
             else:
                 data_editor = st.session_state.all_movie_data[st.session_state.current_movie_key]
-                def to_str_editor(val): return str(val) if val is not None else ""
-                st.session_state.editor_id = to_str_editor(data_editor.get('id'))
-                st.session_state.editor_content_id = to_str_editor(data_editor.get('content_id'))
-                st.session_state.editor_folder_name = data_editor.get('folder_name', '')
-                st.session_state.editor_title = to_str_editor(data_editor.get('title', ''))
-                st.session_state.editor_original_title = to_str_editor(data_editor.get('originaltitle', ''))
-                if not st.session_state.editor_title: st.session_state.editor_title = to_str_editor(data_editor.get('title_raw', ''))
-                st.session_state.editor_desc = to_str_editor(data_editor.get('description'))
-                st.session_state.editor_year = to_str_editor(data_editor.get('release_year'))
-                st.session_state.editor_date = to_str_editor(data_editor.get('release_date'))
-                st.session_state.editor_runtime = to_str_editor(data_editor.get('runtime'))
-                st.session_state.editor_director = to_str_editor(data_editor.get('director'))
-                st.session_state.editor_maker = to_str_editor(data_editor.get('maker'))
-                st.session_state.editor_label = to_str_editor(data_editor.get('label'))
-                st.session_state.editor_series = to_str_editor(data_editor.get('series'))
-                genres_list_editor = data_editor.get('genres', []) or []
-                st.session_state.editor_genres = ", ".join(to_str_editor(g).strip() for g in genres_list_editor if to_str_editor(g).strip())
-                actresses_list_editor = data_editor.get('actresses', []) or []
-                st.session_state.editor_actresses = ", ".join(to_str_editor(a.get('name', '')).strip() for a in actresses_list_editor if isinstance(a, dict) and to_str_editor(a.get('name', '')).strip())
-                auto_poster_url_editor = get_auto_poster_url(data_editor)
-                default_poster_input_url_editor = data_editor.get('poster_manual_url');
-                if default_poster_input_url_editor is None: default_poster_input_url_editor = auto_poster_url_editor or ''
-                st.session_state.editor_poster_url = to_str_editor(default_poster_input_url_editor)
-                st.session_state._original_editor_poster_url = st.session_state.editor_poster_url
+                g = data_editor.get; ss = st.session_state # Local bindings for the field loop
+                for ss_key, data_key in _EDITOR_FIELD_MAP:
+                    ss[ss_key] = _to_str(g(data_key))
+                ss.editor_folder_name = g('folder_name', '')
+                if not ss.editor_title: ss.editor_title = _to_str(g('title_raw', ''))
+                genres_list_editor = g('genres', []) or []
+                ss.editor_genres = ", ".join(stripped for genre in genres_list_editor if (stripped := _to_str(genre).strip()))
+                actresses_list_editor = g('actresses', []) or []
+                ss.editor_actresses = ", ".join(stripped for a in actresses_list_editor if isinstance(a, dict) and (stripped := _to_str(a.get('name', '')).strip()))
+                default_poster_input_url_editor = g('poster_manual_url')
+                if default_poster_input_url_editor is None: default_poster_input_url_editor = get_auto_poster_url(data_editor) or ''
+                ss.editor_poster_url = _to_str(default_poster_input_url_editor)
+                ss._original_editor_poster_url = ss.editor_poster_url
 
             with st.form(key="editor_form"): # Editor Form Content
                 img_col, text_col = st.columns([1.2, 2])
@@ -2434,14 +2851,17 @@ def show_crawler_page():
                     display_poster_url_val = st.session_state.get('editor_poster_url', '')
                     current_movie_data_poster = st.session_state.all_movie_data.get(st.session_state.current_movie_key, {})
                     source_page_url_poster = current_movie_data_poster.get('url', '')
-                    if display_poster_url_val:
+                    if display_poster_url_val and not _URL_RE.match(display_poster_url_val):
+                        st.warning(f"Poster URL does not look valid: {display_poster_url_val}")
+                    elif display_poster_url_val:
                         try:
                             abs_poster_url = urljoin(source_page_url_poster, display_poster_url_val)
+                            poster_image_source = _editor_image_source(abs_poster_url)
                             source_lower_poster = current_movie_data_poster.get('source', '').lower()
                             if source_lower_poster.startswith('r18') or source_lower_poster.startswith('mgs') or source_lower_poster == 'manual':
-                                st.image(abs_poster_url, caption="Poster Preview")
+                                st.image(poster_image_source, caption="Poster Preview")
                             else:
-                                st.image(abs_poster_url, use_container_width=True, caption="Poster Preview")
+                                st.image(poster_image_source, use_container_width=True, caption="Poster Preview")
                         except Exception as e_img: st.warning(f"Could not load poster preview: {e_img}")
                     else: st.info("No poster image URL provided.")
                 with text_col: # Text Inputs
@@ -2470,21 +2890,22 @@ def show_crawler_page():
             # --- Download All Checkbox & Screenshot Display Section ---
             data_current_movie = st.session_state.all_movie_data.get(st.session_state.current_movie_key, {})
             download_all_cb_key = f"cb_download_all_{st.session_state.current_movie_key}"
-            st.checkbox("Download all images for this movie", value=data_current_movie.get('download_all', False), key=download_all_cb_key, on_change=update_download_all_flag, help="...")
-
             global_show_screenshots_setting = st.session_state.get("editor_show_screenshots", True)
             
             if "show_current_movie_screenshots_override" not in st.session_state:
                 st.session_state.show_current_movie_screenshots_override = False
 
             temp_override_for_this_movie = False
-            if not global_show_screenshots_setting:
-                # The checkbox's state directly becomes the override for this render cycle
-                temp_override_for_this_movie = st.checkbox(
-                    "Show additional images for this movie only",
-                    key="show_current_movie_screenshots_override", # This state is reset on navigation
-                    help="Temporarily display additional images for the current movie."
-                )
+            with st.form(key="movie_toggles_form"): # Batch both toggles into a single rerun on Apply
+                st.checkbox("Download all images for this movie", value=data_current_movie.get('download_all', False), key=download_all_cb_key, help="...")
+                if not global_show_screenshots_setting:
+                    # The checkbox's submitted state becomes the override for this render cycle
+                    temp_override_for_this_movie = st.checkbox(
+                        "Show additional images for this movie only",
+                        key="show_current_movie_screenshots_override", # This state is reset on navigation
+                        help="Temporarily display additional images for the current movie."
+                    )
+                st.form_submit_button("Apply", on_click=apply_movie_toggles_callback)
             
             should_display_screenshots = global_show_screenshots_setting or temp_override_for_this_movie
 
@@ -2494,7 +2915,9 @@ def show_crawler_page():
                 if screenshots_list:
                     auto_poster_url_ss = get_auto_poster_url(data_current_movie)
                     actual_poster_url_ss = data_current_movie.get('poster_manual_url', auto_poster_url_ss)
-                    screenshots_to_render = [ss for ss in screenshots_list if ss and ss != actual_poster_url_ss]
+                    # (relative, absolute) pairs resolved once per render instead of inside each column block
+                    screenshots_to_render = [(ss, _to_abs(source_page_url_ss, ss)) for ss in screenshots_list
+                                             if ss and ss != actual_poster_url_ss and _URL_RE.match(ss)]
 
                     if screenshots_to_render:
                         num_ss_to_render = len(screenshots_to_render)
@@ -2509,13 +2932,13 @@ def show_crawler_page():
                             elif overall_source_ss == 'mgs': no_stretch_ss = True
                             elif ss_list_source is None and overall_source_ss.startswith('r18'): no_stretch_ss = True
                             elif overall_source_ss == 'manual': no_stretch_ss = True
-                            for idx_ss, url_ss_relative in enumerate(screenshots_to_render):
+                            image_kwargs_ss = {} if no_stretch_ss else {"use_container_width": True}
+                            _image = st.image; _image_source = _editor_image_source; _basename = os.path.basename # Local bindings for the loop
+                            for idx_ss, (url_ss_relative, abs_url_ss) in enumerate(screenshots_to_render):
                                 with cols_ss_display[idx_ss % num_cols_ss]:
                                     try:
-                                        abs_url_ss = urljoin(source_page_url_ss, url_ss_relative)
-                                        if no_stretch_ss: st.image(abs_url_ss, caption=f"Image {idx_ss+1}")
-                                        else: st.image(abs_url_ss, use_container_width=True, caption=f"Image {idx_ss+1}")
-                                    except Exception as e_ss: st.warning(f"Image {idx_ss+1} ({os.path.basename(url_ss_relative)}) error: {e_ss}")
+                                        _image(_image_source(abs_url_ss), caption=f"Image {idx_ss+1}", **image_kwargs_ss)
+                                    except Exception as e_ss: st.warning(f"Image {idx_ss+1} ({_basename(url_ss_relative)}) error: {e_ss}")
                     elif data_current_movie.get('screenshot_urls'):
                         st.info("No additional screenshots available...") # Simplified message
                     else:
@@ -2535,11 +2958,17 @@ def show_crawler_page():
                                 if st.session_state.get("last_crawl_was_recursive", False)
                                 else os.path.basename(st.session_state.current_movie_key))
             st.caption(f"Displaying processed data for: {display_key_name_raw}")
-            display_data_raw = current_movie_data_raw.copy()
-            display_data_raw.pop('folder_url', None)
-            display_data_raw.pop('folder_image_constructed_url', None)
-            display_data_raw.pop('folder_manual_url', None) 
-            st.json(display_data_raw, expanded=True)
+            raw_expanded = st.session_state.get("_raw_expanded", False)
+            st.button("Hide raw data" if raw_expanded else "Show raw data", key="toggle_raw_data_button", on_click=toggle_raw_data_expanded)
+            with st.expander("Raw data", expanded=raw_expanded):
+                if raw_expanded: # Only copy and serialize the movie dict when the user asked for it
+                    display_data_raw = current_movie_data_raw.copy()
+                    display_data_raw.pop('folder_url', None)
+                    display_data_raw.pop('folder_image_constructed_url', None)
+                    display_data_raw.pop('folder_manual_url', None) 
+                    st.json(display_data_raw, expanded=False)
+                else:
+                    st.caption("Click 'Show raw data' to load the processed data.")
         elif st.session_state.all_movie_data:
              st.info("Select a movie in the 'Editor' view to see its processed data here.")
         else:
@@ -2547,11 +2976,75 @@ def show_crawler_page():
     # --- End View Rendering ---
 
 # --- Settings Page ---
+@st.cache_data(show_spinner=False)
+def _priority_layout(num_columns):
+    """Splits the static Field Priority fields into num_columns balanced, order-preserving column tuples."""
+    base_items_per_col, remainder = divmod(len(_ORDERED_PRIORITY_FIELDS_WITH_LABELS), num_columns)
+    fields_iter = iter(_ORDERED_PRIORITY_FIELDS_WITH_LABELS)
+    return tuple(
+        tuple(itertools.islice(fields_iter, base_items_per_col + (col_idx < remainder)))
+        for col_idx in range(num_columns)
+    )
+
+def _render_field_priorities(field_priorities):
+    """Renders the Field Priority inputs. Called inside settings_form, so edits only rerun on Save."""
+    st.subheader("Field Priority")
+    st.caption("Define the order scrapers are checked (left-to-right) for each field. Enter scraper names separated by commas (e.g., DMM, R18.Dev, MGS). Invalid names are ignored.")
+    if field_priorities is not None and _ORDERED_PRIORITY_FIELDS_WITH_LABELS is not None:
+        num_columns = 3
+        column_fields = _priority_layout(num_columns)
+
+        joined_priorities = {k: ", ".join(v) for k, v in field_priorities.items()}
+
+        for col, fields_in_col in zip(st.columns(num_columns), column_fields):
+            with col:
+                for field_key, display_label in fields_in_col:
+                    input_key = _PRIORITY_INPUT_KEYS[field_key]
+                    st.session_state.setdefault(input_key, joined_priorities.get(field_key, ""))
+                    st.text_input(label=display_label, key=input_key)
+    else:
+         st.warning("Field priorities not found in session state or settings.")
+
+# Naming Conventions inputs: (label, widget key, session state key); first three go in the left column
+NAMING_FIELDS = (
+    ("Folder Name Pattern", "ui_naming_folder_name_pattern", "naming_folder_name_pattern"),
+    ("Title Pattern", "ui_naming_nfo_title_pattern", "naming_nfo_title_pattern"),
+    ("Poster Filename Pattern", "ui_naming_poster_filename_pattern", "naming_poster_filename_pattern"),
+    ("Folder Image Filename Pattern", "ui_naming_folder_image_filename_pattern", "naming_folder_image_filename_pattern"),
+    ("Screenshot Filename Pattern", "ui_naming_screenshot_filename_pattern", "naming_screenshot_filename_pattern"),
+)
+
+_NAMING_PLACEHOLDERS_HELP = (
+    "Available placeholders: `{id}`, `{content_id}`, `{title}` (semantic, post-translation), "
+    "`{original_title}`, `{year}`, `{studio}` (maker), "
+    "`{actress}` (all actress names, comma-separated), or `{actress:N}` (first N names), "
+    "`{original_filename_base}` (video filename without ext), "
+    "`{n}` (screenshot index, 1-based)."
+)
+
+# Session keys read by the Settings page widgets, snapshotted once per render
+_SETTINGS_PAGE_STATE_KEYS = (
+    "enabled_scrapers", "field_priorities", "_genre_blacklist_str",
+    "naming_folder_name_pattern", "naming_nfo_title_pattern", "naming_poster_filename_pattern",
+    "naming_folder_image_filename_pattern", "naming_screenshot_filename_pattern",
+)
+
 def show_settings_page():
     sync_settings_from_file_to_state()
+    state_snapshot = {key: st.session_state.get(key) for key in _SETTINGS_PAGE_STATE_KEYS}
+    enabled_scrapers_snapshot = state_snapshot["enabled_scrapers"] or []
+
+    # Seed widget keys on first render only; afterwards Streamlit hydrates the widgets from their keys
+    for scraper_name in AVAILABLE_SCRAPER_NAMES:
+        st.session_state.setdefault(f"enable_{scraper_name}", scraper_name in enabled_scrapers_snapshot)
+    st.session_state.setdefault("ui_genre_blacklist_input_settings", state_snapshot["_genre_blacklist_str"] or "")
+    for _, widget_key, state_key in NAMING_FIELDS:
+        st.session_state.setdefault(widget_key, state_snapshot[state_key])
     st.markdown("<h1 style='padding-top: 0px; margin-top: 0px;'>⚙️ Settings</h1>", unsafe_allow_html=True)
 
-    with st.form("settings_form"):
+    # Every settings widget lives inside this one form: edits are batched client-side and
+    # persisted only by save_settings_callback on submit (no per-widget on_change reruns).
+    with st.form("settings_form", clear_on_submit=False):
 
         # Enabled Scrapers
         st.subheader("Enabled Scrapers")
@@ -2564,95 +3057,51 @@ def show_settings_page():
                 specific_help = "May require a Japanese IP address."
             st.checkbox(scraper_name,
                          key=f"enable_{scraper_name}",
-                         value=(scraper_name in st.session_state.get('enabled_scrapers', [])),
                          help=specific_help
                          )
             
         st.divider()
 
         # Field Priority
-        st.subheader("Field Priority")
-        st.caption("Define the order scrapers are checked (left-to-right) for each field. Enter scraper names separated by commas (e.g., DMM, R18.Dev, MGS). Invalid names are ignored.")
-        if 'field_priorities' in st.session_state and hasattr(app_settings, 'ORDERED_PRIORITY_FIELDS_WITH_LABELS'):
-            ordered_fields_with_labels = app_settings.ORDERED_PRIORITY_FIELDS_WITH_LABELS
-            total_fields = len(ordered_fields_with_labels)
-            num_columns = 3
-            base_items_per_col = total_fields // num_columns
-            remainder = total_fields % num_columns
-
-            cols = st.columns(num_columns)
-            field_idx = 0
-            for col_idx in range(num_columns):
-                with cols[col_idx]:
-                    items_in_this_col = base_items_per_col + (1 if col_idx < remainder else 0)
-                    for _ in range(items_in_this_col):
-                        if field_idx < total_fields:
-                            field_key, display_label = ordered_fields_with_labels[field_idx]
-                            current_priority_list = st.session_state.field_priorities.get(field_key, [])
-                            st.text_input(
-                                label=display_label,
-                                key=f"priority_{field_key}",
-                                value=", ".join(current_priority_list)
-                            )
-                            field_idx += 1
-                        else: break
-        else:
-             st.warning("Field priorities not found in session state or settings.")
+        _render_field_priorities(state_snapshot["field_priorities"])
 
         st.divider()
 
         st.subheader("Genre Blacklist")
         st.caption("Enter genres to exclude, separated by commas (e.g., Short, Parody, Featured). This is case-insensitive.")
         
-        current_blacklist_display_str = ", ".join(st.session_state.get("genre_blacklist", []))
         st.text_area(
             "Blacklisted Genres:",
             key="ui_genre_blacklist_input_settings", 
-            value=current_blacklist_display_str,
             height=100
         )
 
         st.divider()
 
         st.subheader("Naming Conventions")
-        naming_placeholders_help = (
-            "Available placeholders: `{id}`, `{content_id}`, `{title}` (semantic, post-translation), "
-            "`{original_title}`, `{year}`, `{studio}` (maker), "
-            "`{actress}` (all actress names, comma-separated), or `{actress:N}` (first N names), "
-            "`{original_filename_base}` (video filename without ext), "
-            "`{n}` (screenshot index, 1-based)."
-        )
-        st.caption(naming_placeholders_help)
+        st.caption(_NAMING_PLACEHOLDERS_HELP)
 
         naming_col1, naming_col2 = st.columns(2)
         with naming_col1:
-            st.text_input("Folder Name Pattern", key="ui_naming_folder_name_pattern", value=st.session_state.naming_folder_name_pattern)
-            st.text_input("Title Pattern", key="ui_naming_nfo_title_pattern", value=st.session_state.naming_nfo_title_pattern)
-            st.text_input("Poster Filename Pattern", key="ui_naming_poster_filename_pattern", value=st.session_state.naming_poster_filename_pattern)
+            for label, widget_key, _ in NAMING_FIELDS[:3]:
+                st.text_input(label, key=widget_key)
         with naming_col2:
-            st.text_input("Folder Image Filename Pattern", key="ui_naming_folder_image_filename_pattern", value=st.session_state.naming_folder_image_filename_pattern)
-            st.text_input("Screenshot Filename Pattern", key="ui_naming_screenshot_filename_pattern", value=st.session_state.naming_screenshot_filename_pattern)
+            for label, widget_key, _ in NAMING_FIELDS[3:]:
+                st.text_input(label, key=widget_key)
 
 
         st.divider()
 
         st.subheader("Translation")
-        translator_options = ["None", "Google", "DeepL", "DeepSeek"]
         
-        # Row 1 for main translation inputs
-        trans_row1_col1, trans_row1_col2, _ = st.columns(3) # Third column is unused to control width
-        with trans_row1_col1:
-            st.selectbox("Translator Service", options=translator_options, key="translator_service")
+        # One column set: inputs stacked above their option checkboxes in each column
+        trans_col1, trans_col2, _ = st.columns(3) # Third column is unused to control width
+        with trans_col1:
+            st.selectbox("Translator Service", options=TRANSLATOR_OPTIONS, key="translator_service")
             st.text_input("API Key", key="api_key", type="password", help="Required for DeepL and DeepSeek services.")
-        with trans_row1_col2:
-            st.text_input("Target Language Code", key="target_language", help="e.g., EN, DE, FR. Check service documentation.")
-
-        # Row 2 for translation option checkboxes
-        # These columns will also be 1/3 width each, aligning with the inputs above.
-        trans_row2_col1, trans_row2_col2, _ = st.columns(3) # Third column unused
-        with trans_row2_col1:
             st.checkbox("Translate Title", key="translate_title") 
-        with trans_row2_col2:
+        with trans_col2:
+            st.text_input("Target Language Code", key="target_language", help="e.g., EN, DE, FR. Check service documentation.")
             st.checkbox("Translate Description", key="translate_description")
             st.checkbox("Keep Original Description", key="keep_original_description", help="If 'Translate Description' is also checked, appends translation below original text.")
 
@@ -2676,35 +3125,40 @@ def show_settings_page():
             st.text_input("Default Output Directory", key="output_dir")
 
         # Save button
-        save_button = st.form_submit_button("💾 Save All Settings", use_container_width=True, on_click=save_settings_callback)
+        st.form_submit_button("💾 Save All Settings", use_container_width=True, on_click=save_settings_callback)
 
 # --- End Settings Page ---
 
 # --- Sidebar ---
+def _crawler_view_selector():
+    """Sidebar 'View Mode' switch, rendered only while the Crawler page is active."""
+    st.sidebar.radio( 
+        "View Mode", 
+        options=CRAWLER_VIEW_OPTIONS, 
+        key="crawler_view", # This key is used by show_crawler_page
+        index=_CRAWLER_VIEW_INDEX.get(st.session_state.get("crawler_view"), 0), # Default to Editor
+        # label_visibility="collapsed" # If you prefer no explicit "View Mode" label
+    )
+
+# Built every run on purpose: st.navigation selects this run's page, and st.Page wraps the page functions
+# of the current script execution, so caching either (e.g. st.cache_resource) would pin stale functions
+# and share single-use page objects between sessions. Both calls are cheap descriptor constructions.
+crawler_page = st.Page(show_crawler_page, title="🎬 Crawler", default=True) # Set one as default
 pg = st.navigation(
     [
-        st.Page(show_crawler_page, title="🎬 Crawler", default=True), # Set one as default
+        crawler_page,
         st.Page(show_settings_page, title="⚙️ Settings"),
     ]
 )
 
-if 'active_page_func_name' not in st.session_state:
-    # Set a default based on which st.Page is 'default=True'
-    st.session_state.active_page_func_name = show_crawler_page.__name__
+# Track the page st.navigation actually selected for this run
+st.session_state.active_page_func_name = show_crawler_page.__name__ if pg.title == crawler_page.title else show_settings_page.__name__
 
-if st.session_state.get("active_page_func_name") == show_crawler_page.__name__:
-    crawler_view_options = ["Editor", "Raw Data"]
-    current_crawler_view_index = 0
-    if 'crawler_view' in st.session_state:
-         try: current_crawler_view_index = crawler_view_options.index(st.session_state.crawler_view)
-         except ValueError: current_crawler_view_index = 0 # Default to Editor
-    st.sidebar.radio( 
-        "View Mode", 
-        options=crawler_view_options, 
-        key="crawler_view", # This key is used by show_crawler_page
-        index=current_crawler_view_index,
-        # label_visibility="collapsed" # If you prefer no explicit "View Mode" label
-    )
+if st.session_state.active_page_func_name == show_crawler_page.__name__:
+    _crawler_view_selector()
+elif "crawler_view" in st.session_state:
+    # Radio isn't rendered on this page; re-assign so Streamlit keeps the widget value for the way back
+    st.session_state.crawler_view = st.session_state.crawler_view
 
 pg.run()
 # --- End Sidebar ---
\ No newline at end of file
@@ -1,20 +1,19 @@
 from PIL import Image
 import sys
 
-try:
-    cover_path = sys.argv[1]
-    cover_cropped_path = sys.argv[2]
-    original_cover = Image.open(cover_path)
-    width, height = original_cover.size
-    left = width/1.895734597
-    top = 0
-    right = width
-    bottom = height
-except:
-    pass
+def crop_image(cover_path, cover_cropped_path):
+    """Saves the right-hand (front cover) part of a DVD cover image as cover_cropped_path. Raises on failure."""
+    with Image.open(cover_path) as original_cover:
+        width, height = original_cover.size
+        left = width/1.895734597
+        top = 0
+        right = width
+        bottom = height
+        cropped_cover = original_cover.crop((left, top, right, bottom))
+        cropped_cover.save(cover_cropped_path)
 
-try:
-    cropped_cover = original_cover.crop((left, top, right, bottom))
-    cropped_cover.save(cover_cropped_path)
-except:
-    pass
+if __name__ == "__main__":
+    try:
+        crop_image(sys.argv[1], sys.argv[2])
+    except:
+        pass
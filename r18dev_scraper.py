@@ -12,6 +12,11 @@ logging.getLogger("urllib3").setLevel(logging.WARNING)
 # --- User Agent ---
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36'
 
+# --- Shared Session (keep-alive across lookups/scrapes and scraper threads) ---
+_SESSION = requests.Session()
+_SESSION.headers.update({'User-Agent': USER_AGENT})
+_SESSION.mount('https://', requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
 # --- URL Finder Function (get_r18dev_url_from_id - no changes) ---
 def get_r18dev_url_from_id(id_str):
     logging.debug(f"Attempting to find R18.Dev URL for ID: '{id_str}'")
@@ -21,7 +26,7 @@ def get_r18dev_url_from_id(id_str):
     combined_url = None
     try:
         logging.debug(f"Performing GET on URL: {search_url}")
-        response = requests.get(search_url, headers={'User-Agent': USER_AGENT}, timeout=20)
+        response = _SESSION.get(search_url, timeout=20)
         response.raise_for_status()
         data = response.json()
         content_id = data.get('content_id')
@@ -46,7 +51,7 @@ def scrape_r18dev(url):
 
     try:
         logging.debug(f"Performing GET on URL: {url}")
-        response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=25)
+        response = _SESSION.get(url, timeout=25)
         response.raise_for_status()
         webRequest = response.json()
         logging.info(f"Successfully scraped R18.Dev data for URL: {url}")
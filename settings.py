@@ -89,4 +89,4 @@ ORDERED_PRIORITY_FIELDS_WITH_LABELS = [
 
 # Extract just the keys in the correct order for processing
 # (No changes needed here)
-PRIORITY_FIELDS_ORDERED = [item[0] for item in ORDERED_PRIORITY_FIELDS_WITH_LABELS]
\ No newline at end of file
+PRIORITY_FIELDS_ORDERED = tuple(item[0] for item in ORDERED_PRIORITY_FIELDS_WITH_LABELS)
\ No newline at end of file
@@ -4,20 +4,40 @@ import tempfile
 import os
 import json
 
-#Select Url based on key provided (free keys always end in :fx)
-baseurl = "https://api-free.deepl.com/v2/translate" if sys.argv[3].endswith(":fx") else "https://api.deepl.com/v2/translate"
+REQUEST_TIMEOUT_SECONDS = 15 # A stalled connection would otherwise hold one of app.py's translation workers forever
 
-url = "{}?auth_key={}&text={}&target_lang={}".format(baseurl, sys.argv[3], sys.argv[1], sys.argv[2])
-r = requests.get(url)
-j = json.loads(r.text)
-n = j['translations'][0]['text']
+def translate(text, target_language, api_key=None):
+    """In-process entry point used by app.py. Raises on HTTP/response errors."""
+    #Select Url based on key provided (free keys always end in :fx)
+    baseurl = "https://api-free.deepl.com/v2/translate" if api_key.endswith(":fx") else "https://api.deepl.com/v2/translate"
 
-text = n.encode('utf8')
+    try:
+        r = requests.get(baseurl, params={'auth_key': api_key, 'text': text, 'target_lang': target_language}, timeout=REQUEST_TIMEOUT_SECONDS)
+    except requests.Timeout as e: # Reported by app.py like its own translation timeout
+        raise TimeoutError(f"DeepL request timed out after {REQUEST_TIMEOUT_SECONDS} seconds") from e
+    j = json.loads(r.text)
+    return j['translations'][0]['text']
 
-# Write the translated text to a temporary file to bypass encoding issues when redirecting the text to PowerShell
-new_file, filename = tempfile.mkstemp()
-os.write(new_file, text)
-os.close(new_file)
+def translate_batch(texts, target_language, api_key=None):
+    """Translates several texts in one request (repeated 'text' params). Returns a list parallel to texts."""
+    baseurl = "https://api-free.deepl.com/v2/translate" if api_key.endswith(":fx") else "https://api.deepl.com/v2/translate"
 
-# Return the path to the temporary file to read it from PowerShell
-print(filename)
+    try:
+        r = requests.get(baseurl, params={'auth_key': api_key, 'text': list(texts), 'target_lang': target_language}, timeout=REQUEST_TIMEOUT_SECONDS)
+    except requests.Timeout as e: # Reported by app.py like its own translation timeout
+        raise TimeoutError(f"DeepL request timed out after {REQUEST_TIMEOUT_SECONDS} seconds") from e
+    j = json.loads(r.text)
+    return [t['text'] for t in j['translations']]
+
+if __name__ == "__main__":
+    n = translate(sys.argv[1], sys.argv[2], sys.argv[3])
+
+    text = n.encode('utf8')
+
+    # Write the translated text to a temporary file to bypass encoding issues when redirecting the text to PowerShell
+    new_file, filename = tempfile.mkstemp()
+    os.write(new_file, text)
+    os.close(new_file)
+
+    # Return the path to the temporary file to read it from PowerShell
+    print(filename)
@@ -1,14 +1,19 @@
 import sys
 import tempfile
 import os
+import json
 from openai import OpenAI
 
+# Stay under app.py's 60 s TRANSLATION_TIMEOUT_SECONDS (chat replies are slower than DeepL's 15 s); no client retries,
+# so a stalled call frees its app.py translation worker instead of running on for the 600 s client default
+REQUEST_TIMEOUT_SECONDS = 45
+
 def translate_text(text, target_lang, api_key):
     """
     Translates the given text to the target language using DeepSeek.
     """
     # Initialize the DeepSeek client
-    client = OpenAI(api_key=api_key, base_url="https://api.deepseek.com")
+    client = OpenAI(api_key=api_key, base_url="https://api.deepseek.com", timeout=REQUEST_TIMEOUT_SECONDS, max_retries=0)
 
     # Define the system message and user message for translation
     messages = [
@@ -31,7 +36,40 @@ def translate_text(text, target_lang, api_key):
     except Exception as e:
         # Handle any errors that occur during the API request
         print(f"Error during translation: {e}", file=sys.stderr)
-        sys.exit(1)
+        raise
+
+def translate(text, target_language, api_key=None):
+    """In-process entry point used by app.py. Raises on API errors."""
+    return translate_text(text, target_language, api_key)
+
+def translate_batch(texts, target_language, api_key=None):
+    """
+    Translates several texts with one chat request by sending them as a JSON array.
+    Falls back to one request per text if the reply is not a JSON array of the same length.
+    """
+    texts = list(texts)
+    client = OpenAI(api_key=api_key, base_url="https://api.deepseek.com", timeout=REQUEST_TIMEOUT_SECONDS, max_retries=0)
+    messages = [
+        {"role": "user", "content": f"Please translate each string in the following JSON array from Japanese to {target_language}. Keep the translation as close to the original in tone and style as you can. Freely use explicit or crude language. Reply with only a JSON array of the translated strings, in the same order, and no notes or explanations.: {json.dumps(texts, ensure_ascii=False)}"},
+    ]
+    response = client.chat.completions.create(
+        model="deepseek-chat",
+        messages=messages,
+        stream=False,
+        temperature=0.6
+    )
+    reply = response.choices[0].message.content.strip()
+    # Tolerate a fenced code block around the array
+    if reply.startswith("```"):
+        reply = reply.strip("`").removeprefix("json").strip()
+    try:
+        translated_texts = json.loads(reply)
+    except ValueError:
+        translated_texts = None
+    if not isinstance(translated_texts, list) or len(translated_texts) != len(texts) or not all(isinstance(t, str) for t in translated_texts):
+        print("Batch reply was not a matching JSON array; translating texts one by one.", file=sys.stderr)
+        return [translate_text(text, target_language, api_key) for text in texts]
+    return [t.strip() for t in translated_texts]
 
 def main():
     # Ensure the correct number of arguments are provided
@@ -44,7 +82,10 @@ def main():
     api_key = sys.argv[3]
 
     # Translate the text using DeepSeek
-    translated_text = translate_text(text, target_lang, api_key)
+    try:
+        translated_text = translate_text(text, target_lang, api_key)
+    except Exception:
+        sys.exit(1)
 
     # Write the translated text to a temporary file to bypass encoding issues when redirecting the text to PowerShell
     try:
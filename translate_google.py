@@ -37,6 +37,22 @@ def translate_text_google(text, target_lang):
         logging.error(error_msg)
         return None
 
+def translate(text, target_language, api_key=None):
+    """In-process entry point used by app.py (api_key is unused for googletrans). Returns None on failure."""
+    return translate_text_google(text, target_language)
+
+def translate_batch(texts, target_language, api_key=None):
+    """Translates several texts in one googletrans call. Returns a list parallel to texts, or None on failure."""
+    try:
+        logging.info(f"Attempting batch translation of {len(texts)} texts to '{target_language}'...")
+        translation_results = Translator().translate(list(texts), dest=target_language)
+        return [result.text for result in translation_results]
+    except Exception as e:
+        error_msg = f"Error during Google batch translation: {e}"
+        print(error_msg, file=sys.stderr)
+        logging.error(error_msg)
+        return None
+
 def main():
     parser = argparse.ArgumentParser(description="Translate text using Google Translate (googletrans).")
     parser.add_argument("text", help="The text to translate.")
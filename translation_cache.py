@@ -0,0 +1,66 @@
+# START OF FILE translation_cache.py
+# Persistent translation cache (local SQLite file) so identical titles/descriptions are not re-translated across runs.
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+CACHE_FILE = "translation_cache.sqlite3"
+CACHE_KEY_VERSION = "v1" # Bump to invalidate every cached translation
+DEFAULT_TTL_DAYS = 30
+
+_log = logging.getLogger(__name__)
+
+_init_lock = threading.Lock()
+_initialized = False
+
+def _execute(sql, params):
+    """Runs one statement on a short-lived connection (callers run on several worker threads); returns (rows, rowcount)."""
+    conn = sqlite3.connect(CACHE_FILE, timeout=10)
+    try:
+        with conn: # Commits on success
+            cursor = conn.execute(sql, params)
+            rows = cursor.fetchall()
+            return rows, cursor.rowcount
+    finally:
+        conn.close()
+
+def make_key(service, target_language, text):
+    text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
+    return f"{CACHE_KEY_VERSION}:{service}:{target_language}:{text_hash}"
+
+def _ensure_initialized(ttl_days=DEFAULT_TTL_DAYS):
+    """Creates the table and deletes entries older than ttl_days. Runs once per process (retried until it succeeds)."""
+    global _initialized
+    if _initialized: return
+    with _init_lock:
+        if _initialized: return
+        _execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, ts INTEGER)", ())
+        _initialized = True
+        try:
+            _, deleted = _execute("DELETE FROM cache WHERE ts < ?", (int(time.time()) - ttl_days * 86400,))
+            if deleted: _log.info("Translation cache: removed %s expired entries.", deleted)
+        except sqlite3.Error as e:
+            _log.error("Translation cache sweep failed: %s", e)
+
+def get(service, target_language, text):
+    """Returns the cached translation or None. Cache errors are logged and treated as a miss."""
+    try:
+        _ensure_initialized()
+        rows, _ = _execute("SELECT value FROM cache WHERE key = ?", (make_key(service, target_language, text),))
+        return rows[0][0] if rows else None
+    except sqlite3.Error as e:
+        _log.error("Translation cache lookup failed: %s", e)
+        return None
+
+def put(service, target_language, text, translated_text):
+    try:
+        _ensure_initialized()
+        _execute("INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)",
+                 (make_key(service, target_language, text), translated_text, int(time.time())))
+    except sqlite3.Error as e:
+        _log.error("Translation cache write failed: %s", e)
+
+# END OF FILE translation_cache.py